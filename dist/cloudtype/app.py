@@ -1,24 +1,80 @@
+import atexit
 import os
+import queue
 import re
+import secrets
 import sqlite3
 import tempfile
 import threading
 import time
 import json
-from functools import wraps
+from functools import lru_cache, wraps
+from itertools import groupby
 from importlib import import_module
+from types import MappingProxyType
 
 from flask import Flask, abort, flash, g, redirect, render_template, request, session, url_for
+from flask.json.provider import DefaultJSONProvider
+from werkzeug.http import generate_etag
 from werkzeug.security import check_password_hash, generate_password_hash
 
+# Loaded on first Postgres connection; SQLite deployments never import the driver.
+psycopg2 = None
+RealDictCursor = None
+
+try:
+    orjson = import_module("orjson")
+except ImportError:  # pragma: no cover - optional speedup, stdlib json is the fallback
+    orjson = None
+
 try:
-    psycopg2 = import_module("psycopg2")
-    RealDictCursor = import_module("psycopg2.extras").RealDictCursor
-except Exception:  # pragma: no cover - optional dependency for postgres deployment
-    psycopg2 = None
-    RealDictCursor = None
+    argon2 = import_module("argon2")
+except ImportError:  # pragma: no cover - optional; werkzeug hashes are the fallback
+    argon2 = None
+
+_password_hasher = (
+    argon2.PasswordHasher(time_cost=2, memory_cost=19456, parallelism=1) if argon2 is not None else None
+)
+
+
+def _json_loads(raw):
+    if orjson is not None:
+        return orjson.loads(raw)
+    return json.loads(raw)
+
+
+def _json_dumps(value):
+    if orjson is not None:
+        return orjson.dumps(value).decode("utf-8")
+    return json.dumps(value, ensure_ascii=False)
+
+
+# API responses are encoded with orjson; dates/decimals still go through Flask's default hook.
+class OrjsonProvider(DefaultJSONProvider):
+    options = 0 if orjson is None else (orjson.OPT_SORT_KEYS | orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATETIME)
+
+    def dumps(self, obj, **kwargs):
+        if kwargs:
+            return super().dumps(obj, **kwargs)
+        return orjson.dumps(obj, default=self.default, option=self.options).decode("utf-8")
+
+    def loads(self, s, **kwargs):
+        if kwargs:
+            return super().loads(s, **kwargs)
+        return orjson.loads(s)
+
+    def response(self, *args, **kwargs):
+        obj = self._prepare_response_obj(args, kwargs)
+        options = self.options | orjson.OPT_APPEND_NEWLINE
+        if self._app.debug:
+            options |= orjson.OPT_INDENT_2
+        return self._app.response_class(orjson.dumps(obj, default=self.default, option=options), mimetype=self.mimetype)
+
 
 app = Flask(__name__)
+if orjson is not None:
+    app.json = OrjsonProvider(app)
+DEBUG_MODE = os.environ.get("FLASK_DEBUG", "0") == "1"
 app.config["SECRET_KEY"] = os.environ.get("SECRET_KEY", "change-this-secret-key")
 database_url = os.environ.get("DATABASE_URL", "").strip()
 if database_url.startswith("postgres://"):
@@ -27,6 +83,18 @@ app.config["DATABASE_URL"] = database_url
 app.config["USE_POSTGRES"] = bool(database_url)
 
 
+def _postgres_pool_max_connections():
+    # One connection per gunicorn thread (Procfile --threads), plus the audit log writer and one spare.
+    try:
+        threads = int(os.environ.get("GUNICORN_THREADS", "4"))
+    except ValueError:
+        threads = 4
+    return max(threads, 1) + 2
+
+
+app.config["POSTGRES_POOL_MAXCONN"] = _postgres_pool_max_connections()
+
+
 def _resolve_database_path():
     explicit_path = os.environ.get("DATABASE_PATH", "").strip()
     if explicit_path:
@@ -41,17 +109,18 @@ def _resolve_database_path():
 
 
 app.config["DATABASE"] = _resolve_database_path() if not app.config["USE_POSTGRES"] else ""
+# WAL by default, falling back to an in-memory journal; set SQLITE_JOURNAL_MODE=OFF to skip journaling.
+app.config["SQLITE_JOURNAL_MODE"] = os.environ.get("SQLITE_JOURNAL_MODE", "WAL").strip().upper() or "WAL"
 app.config["SEND_FILE_MAX_AGE_DEFAULT"] = 0
-app.config["TEMPLATES_AUTO_RELOAD"] = True
+app.config["TEMPLATES_AUTO_RELOAD"] = DEBUG_MODE
 app.config["CORS_ALLOW_ORIGIN"] = os.environ.get("CORS_ALLOW_ORIGIN", "*")
-app.jinja_env.auto_reload = True
-
+# Audit log rows are written in the request by default; AUDIT_LOG_ASYNC=1 hands them to a background thread,
+# in which case the activity list on the next page may not show the action just taken yet.
+app.config["AUDIT_LOG_ASYNC"] = os.environ.get("AUDIT_LOG_ASYNC", "0") == "1"
+app.jinja_env.auto_reload = DEBUG_MODE
 
-def _compute_asset_version():
-    fixed_version = os.environ.get("ASSET_VERSION")
-    if fixed_version:
-        return fixed_version
 
+def _compute_asset_version():
     static_candidates = (
         os.path.join(app.root_path, "static", "css", "styles.css"),
         os.path.join(app.root_path, "static", "js", "main.js"),
@@ -60,15 +129,50 @@ def _compute_asset_version():
     mtimes = []
     for path in static_candidates:
         try:
-            mtimes.append(int(os.path.getmtime(path)))
+            mtimes.append(int(os.stat(path).st_mtime))
         except OSError:
             continue
     return str(max(mtimes) if mtimes else 1)
 
 
-ASSET_VERSION = _compute_asset_version()
+# Static files are only stat'ed on first render unless ASSET_VERSION pins the value.
+_asset_version = os.environ.get("ASSET_VERSION") or None
+
+
+def get_asset_version():
+    global _asset_version
+    if _asset_version is None:
+        version = _compute_asset_version()
+        if DEBUG_MODE:
+            # Versioned assets are cached by browsers, so edits must change the URL while developing.
+            return version
+        _asset_version = version
+    return _asset_version
+
+
 _db_init_lock = threading.Lock()
 _db_initialized = False
+_sqlite_local = threading.local()
+_postgres_pool_lock = threading.Lock()
+_postgres_pool = None
+_defaults_seeded = False
+_portfolio_cache_lock = threading.Lock()
+_portfolio_cache = {"key": None, "payload": None, "checked_at": 0.0, "body": None, "etag": None}
+# Within this window a cached payload is served without re-probing the updated_at stamps.
+PORTFOLIO_CACHE_TTL_SECONDS = 5.0
+# Login fields outside these bounds are refused before the users lookup and password hashing.
+LOGIN_USERNAME_MAX_LENGTH = 150
+LOGIN_PASSWORD_MAX_LENGTH = 1024
+_audit_log_queue = queue.Queue()
+_audit_log_writer_lock = threading.Lock()
+_audit_log_writer = None
+AUDIT_LOG_BATCH_SIZE = 64
+AUDIT_LOG_RETRY_DELAY_SECONDS = 1.0
+AUDIT_LOG_FLUSH_TIMEOUT_SECONDS = 10.0
+# Dashboard totals on the admin home page may lag writes by up to this many seconds.
+_dashboard_counts_lock = threading.Lock()
+_dashboard_counts = {"value": None, "checked_at": 0.0}
+DASHBOARD_COUNTS_TTL_SECONDS = 5.0
 
 LICENSE_MENUS = [
     ("qna", "Q&A"),
@@ -80,6 +184,28 @@ LICENSE_MENUS = [
 
 TRACKED_MENUS = {"qna", "assignments", "scores", "notices", "student_accounts"}
 TRACKED_MENU_KEYS = tuple(sorted(TRACKED_MENUS))
+LICENSE_MENU_KEYS = tuple(menu_key for menu_key, _label in LICENSE_MENUS)
+LICENSE_FORM_FIELDS = tuple((menu_key, f"license_{menu_key}") for menu_key in LICENSE_MENU_KEYS)
+LICENSE_ROWS_SEED_SQL = (
+    "INSERT OR IGNORE INTO admin_licenses (admin_id, menu_key, is_enabled) VALUES "
+    + ",".join(["(?, ?, 0)"] * len(LICENSE_MENU_KEYS))
+)
+_LICENSE_ENABLED_CASE_SQL = (
+    "CASE menu_key " + " ".join(["WHEN ? THEN ?"] * len(LICENSE_MENU_KEYS)) + " ELSE is_enabled END"
+)
+# Rows already in the requested state are left untouched, so an unchanged save writes nothing.
+LICENSE_ROWS_UPDATE_SQL = (
+    f"UPDATE admin_licenses SET is_enabled = {_LICENSE_ENABLED_CASE_SQL} "
+    f"WHERE admin_id = ? AND is_enabled <> {_LICENSE_ENABLED_CASE_SQL}"
+)
+ADMIN_ACTIVITY_LOGS_SQL = f"""
+SELECT l.*, u.username AS actor_username, u.full_name AS actor_name
+FROM audit_logs l
+LEFT JOIN users u ON u.id = l.actor_admin_id
+WHERE l.menu_key IN ({",".join(["?"] * len(TRACKED_MENU_KEYS))})
+ORDER BY l.created_at DESC
+LIMIT 80
+"""
 
 PORTFOLIO_DEFAULT_PROFILE = {
     "name": "Jeong Seo-bin",
@@ -115,6 +241,9 @@ PORTFOLIO_DEFAULT_PROJECTS = [
     },
 ]
 
+_PORTFOLIO_DEFAULT_SKILLS_FROZEN = tuple(PORTFOLIO_DEFAULT_SKILLS)
+_PORTFOLIO_DEFAULT_PROJECTS_FROZEN = tuple(MappingProxyType(project) for project in PORTFOLIO_DEFAULT_PROJECTS)
+
 PORTFOLIO_DEFAULT_ABOUT_NOTE = "I structure problems and turn them into fast, practical outcomes."
 PORTFOLIO_DEFAULT_SKILLS_NOTE = "Main stack: HTML, CSS, JavaScript, Python. I can use other languages/tools when needed."
 PORTFOLIO_DEFAULT_CONTACT_NOTE = "For projects, tutoring, or collaboration, please contact me below."
@@ -241,6 +370,7 @@ CREATE TABLE IF NOT EXISTS portfolio_content (
     profile_image_url TEXT,
     skills_json TEXT NOT NULL,
     projects_json TEXT NOT NULL,
+    revision INTEGER NOT NULL DEFAULT 0,
     updated_at TEXT NOT NULL DEFAULT CURRENT_TIMESTAMP
 );
 
@@ -273,28 +403,37 @@ SCHEMA_SQL = SCHEMA_SQL_POSTGRES if app.config["USE_POSTGRES"] else SCHEMA_SQL_S
 
 
 def _split_sql_script(sql_script):
-    return [statement.strip() for statement in sql_script.split(";") if statement.strip()]
+    for statement in sql_script.split(";"):
+        statement = statement.strip()
+        if statement:
+            yield statement
+
+
+SCHEMA_STATEMENTS = tuple(_split_sql_script(SCHEMA_SQL))
+
+
+_RE_INSERT = re.compile(r"^\s*INSERT\s+INTO\s+", re.IGNORECASE)
+_RE_INSERT_OR_IGNORE = re.compile(r"^\s*INSERT\s+OR\s+IGNORE\s+INTO\s+", re.IGNORECASE)
 
 
 def _is_postgres_insert(query):
-    return bool(re.match(r"^\s*INSERT\s+INTO\s+", query, flags=re.IGNORECASE))
+    return _RE_INSERT.match(query) is not None
 
 
+@lru_cache(maxsize=512)
 def _adapt_query_for_postgres(query):
     translated = query
-    used_insert_ignore = bool(re.match(r"^\s*INSERT\s+OR\s+IGNORE\s+INTO\s+", translated, flags=re.IGNORECASE))
+    used_insert_ignore = _RE_INSERT_OR_IGNORE.match(translated) is not None
     if used_insert_ignore:
-        translated = re.sub(
-            r"^\s*INSERT\s+OR\s+IGNORE\s+INTO\s+",
-            "INSERT INTO ",
-            translated,
-            flags=re.IGNORECASE,
-        )
+        translated = _RE_INSERT_OR_IGNORE.sub("INSERT INTO ", translated, count=1)
     translated = translated.replace("?", "%s")
     if used_insert_ignore:
         translated = translated.rstrip().rstrip(";") + " ON CONFLICT DO NOTHING"
 
-    needs_returning_id = _is_postgres_insert(translated) and "RETURNING" not in translated.upper()
+    upper_sql = translated.upper()
+    needs_returning_id = (
+        _is_postgres_insert(translated) and "RETURNING" not in upper_sql and "ON CONFLICT" not in upper_sql
+    )
     if needs_returning_id:
         translated = translated.rstrip().rstrip(";") + " RETURNING id"
 
@@ -323,8 +462,9 @@ class CursorResult:
 
 
 class PostgresConnectionWrapper:
-    def __init__(self, connection):
+    def __init__(self, connection, pool=None):
         self.connection = connection
+        self._pool = pool
 
     def execute(self, query, args=()):
         sql, needs_returning_id = _adapt_query_for_postgres(query)
@@ -345,10 +485,21 @@ class PostgresConnectionWrapper:
         cursor.close()
         return CursorResult(lastrowid=lastrowid)
 
+    def execute_read(self, query, args=(), cursor_factory=None):
+        # Reads never need RETURNING id, so hand back the driver cursor unwrapped.
+        sql, _needs_returning_id = _adapt_query_for_postgres(query)
+        cursor = self.connection.cursor(cursor_factory=cursor_factory)
+        cursor.execute(sql, args)
+        return cursor
+
+    def execute_tuples(self, query, args=()):
+        return self.execute_read(query, args, cursor_factory=psycopg2.extensions.cursor)
+
     def executescript(self, sql_script):
+        statements = SCHEMA_STATEMENTS if sql_script is SCHEMA_SQL else _split_sql_script(sql_script)
         cursor = self.connection.cursor()
         try:
-            for statement in _split_sql_script(sql_script):
+            for statement in statements:
                 cursor.execute(statement)
         finally:
             cursor.close()
@@ -356,102 +507,379 @@ class PostgresConnectionWrapper:
     def commit(self):
         self.connection.commit()
 
+    def rollback(self):
+        self.connection.rollback()
+
     def close(self):
-        self.connection.close()
+        if self._pool is None:
+            self.connection.close()
+            return
+
+        # Hand the connection back without leftover transaction state; drop it if it broke.
+        discard = bool(self.connection.closed)
+        if not discard:
+            try:
+                self.connection.rollback()
+            except psycopg2.Error:
+                discard = True
+        self._pool.putconn(self.connection, close=discard)
 
 
-_db_operational_errors = [sqlite3.OperationalError]
-if psycopg2 is not None:
-    _db_operational_errors.append(psycopg2.OperationalError)
-DB_OPERATIONAL_ERRORS = tuple(_db_operational_errors)
+def _load_psycopg2():
+    global psycopg2, RealDictCursor
+    if psycopg2 is None:
+        try:
+            driver = import_module("psycopg2")
+            cursor_factory = import_module("psycopg2.extras").RealDictCursor
+        except ImportError:  # pragma: no cover - optional dependency for postgres deployment
+            raise RuntimeError("DATABASE_URL is set but psycopg2 is not installed.") from None
+        psycopg2, RealDictCursor = driver, cursor_factory
+    return psycopg2
+
+
+def _db_operational_errors():
+    if psycopg2 is None:
+        return (sqlite3.OperationalError,)
+    return (sqlite3.OperationalError, psycopg2.OperationalError)
+
+
+def _db_integrity_errors():
+    if psycopg2 is None:
+        return (sqlite3.IntegrityError,)
+    return (sqlite3.IntegrityError, psycopg2.IntegrityError)
+
+
+def _get_postgres_pool():
+    global _postgres_pool
+    if _postgres_pool is None:
+        with _postgres_pool_lock:
+            if _postgres_pool is None:
+                _load_psycopg2()
+                pool_module = import_module("psycopg2.pool")
+                _postgres_pool = pool_module.ThreadedConnectionPool(
+                    1,
+                    app.config["POSTGRES_POOL_MAXCONN"],
+                    app.config["DATABASE_URL"],
+                    cursor_factory=RealDictCursor,
+                )
+    return _postgres_pool
+
+
+def _apply_sqlite_journal_mode(connection):
+    # WAL lets readers proceed during a write and needs only one fsync per checkpoint.
+    if app.config["SQLITE_JOURNAL_MODE"] == "WAL":
+        try:
+            mode_row = connection.execute("PRAGMA journal_mode = WAL").fetchone()
+            if mode_row is not None and str(mode_row[0]).lower() == "wal":
+                connection.execute("PRAGMA synchronous = NORMAL")
+                # Truncate the -wal file back to 64MB after checkpoints instead of keeping its peak size.
+                connection.execute("PRAGMA journal_size_limit = 67108864")
+                return
+        except sqlite3.OperationalError:
+            pass
+
+    # Sandbox/Cloud-sync environments can fail SQLite journaling writes.
+    # An in-memory rollback journal writes no side file but still supports ROLLBACK.
+    fallback_modes = ("OFF",) if app.config["SQLITE_JOURNAL_MODE"] == "OFF" else ("MEMORY", "OFF")
+    for journal_mode in fallback_modes:
+        try:
+            mode_row = connection.execute(f"PRAGMA journal_mode = {journal_mode}").fetchone()
+            connection.execute("PRAGMA synchronous = OFF")
+        except sqlite3.OperationalError:
+            continue
+        if mode_row is not None and str(mode_row[0]).upper() == journal_mode:
+            return
+
+
+def _connect_sqlite():
+    db_path = app.config["DATABASE"]
+    try:
+        parent_dir = os.path.dirname(os.path.abspath(db_path))
+        if parent_dir:
+            os.makedirs(parent_dir, exist_ok=True)
+        connection = sqlite3.connect(db_path, timeout=10, cached_statements=256)
+    except (sqlite3.OperationalError, OSError):
+        # Fallback for environments where project path may be read-only.
+        fallback = os.path.join(tempfile.gettempdir(), "portfolio.sqlite3")
+        app.config["DATABASE"] = fallback
+        connection = sqlite3.connect(fallback, timeout=10, cached_statements=256)
+    connection.row_factory = sqlite3.Row
+    connection.execute("PRAGMA busy_timeout = 5000")
+    # Only takes effect while the file is still empty (first boot), so it must precede WAL and the schema.
+    connection.execute("PRAGMA page_size = 8192")
+    _apply_sqlite_journal_mode(connection)
+    connection.execute("PRAGMA foreign_keys = ON")
+    # Read-heavy views: 64MB page cache, memory-mapped reads, in-memory temp tables.
+    try:
+        connection.executescript(
+            """
+            PRAGMA cache_size = -65536;
+            PRAGMA mmap_size = 268435456;
+            PRAGMA temp_store = MEMORY;
+            """
+        )
+    except sqlite3.OperationalError:
+        pass
+    return connection
 
 
 def get_db():
     if "db" not in g:
         if app.config["USE_POSTGRES"]:
-            if psycopg2 is None:
-                raise RuntimeError("DATABASE_URL is set but psycopg2 is not installed.")
-            connection = psycopg2.connect(app.config["DATABASE_URL"], cursor_factory=RealDictCursor)
+            pool = _get_postgres_pool()
+            connection = pool.getconn()
             connection.autocommit = False
-            g.db = PostgresConnectionWrapper(connection)
+            g.db = PostgresConnectionWrapper(connection, pool=pool)
         else:
-            db_path = app.config["DATABASE"]
-            try:
-                parent_dir = os.path.dirname(os.path.abspath(db_path))
-                if parent_dir:
-                    os.makedirs(parent_dir, exist_ok=True)
-                connection = sqlite3.connect(db_path, timeout=10)
-            except (sqlite3.OperationalError, OSError):
-                # Fallback for environments where project path may be read-only.
-                fallback = os.path.join(tempfile.gettempdir(), "portfolio.sqlite3")
-                app.config["DATABASE"] = fallback
-                connection = sqlite3.connect(fallback, timeout=10)
-            connection.row_factory = sqlite3.Row
-            connection.execute("PRAGMA busy_timeout = 5000")
-            # Sandbox/Cloud-sync environments can fail SQLite journaling writes.
-            try:
-                connection.execute("PRAGMA journal_mode = OFF")
-                connection.execute("PRAGMA synchronous = OFF")
-            except sqlite3.OperationalError:
-                pass
-            connection.execute("PRAGMA foreign_keys = ON")
+            # One connection per worker thread, reused across requests.
+            connection = getattr(_sqlite_local, "connection", None)
+            if connection is None:
+                connection = _connect_sqlite()
+                _sqlite_local.connection = connection
             g.db = connection
     return g.db
 
 
 def query_db(query, args=(), one=False):
-    cursor = get_db().execute(query, args)
+    db = get_db()
+    execute = getattr(db, "execute_read", db.execute)
+    cursor = execute(query, args)
+    if one:
+        row = cursor.fetchone()
+        cursor.close()
+        return row
     rows = cursor.fetchall()
     cursor.close()
+    return rows
+
+
+def query_db_iter(query, args=(), batch_size=32):
+    # Yields rows in batches so templates can iterate without a fully materialized list.
+    db = get_db()
+    execute = getattr(db, "execute_read", db.execute)
+    cursor = execute(query, args)
+    try:
+        while True:
+            rows = cursor.fetchmany(batch_size)
+            if not rows:
+                return
+            yield from rows
+    finally:
+        cursor.close()
+
+
+def query_db_tuples(query, args=(), one=False):
+    db = get_db()
+    if app.config["USE_POSTGRES"]:
+        cursor = db.execute_tuples(query, args)
+    else:
+        cursor = db.cursor()
+        cursor.row_factory = None
+        cursor.execute(query, args)
     if one:
-        return rows[0] if rows else None
+        row = cursor.fetchone()
+        cursor.close()
+        return row
+    rows = cursor.fetchall()
+    cursor.close()
     return rows
 
 
+def query_scalar(query, args=()):
+    # First column of the first row, read as a plain tuple; None when no row matches.
+    row = query_db_tuples(query, args, one=True)
+    return None if row is None else row[0]
+
+
+SQLITE_SUPPORTS_RETURNING = sqlite3.sqlite_version_info >= (3, 35, 0)
+_RE_RETURNING_CLAUSE = re.compile(r"\s+RETURNING\s.*$", re.IGNORECASE | re.DOTALL)
+
+
+def execute_returning(query, args, fallback_query, fallback_args=None):
+    # Runs an UPDATE/DELETE ... RETURNING and hands back its first row (None when nothing matched).
+    # SQLite older than 3.35 has no RETURNING, so the row is read with fallback_query beforehand.
+    db = get_db()
+    if app.config["USE_POSTGRES"] or SQLITE_SUPPORTS_RETURNING:
+        cursor = db.execute(query, args)
+        row = cursor.fetchone()
+        cursor.close()
+        return row
+
+    row = query_db(fallback_query, args if fallback_args is None else fallback_args, one=True)
+    if row is not None:
+        db.execute(_RE_RETURNING_CLAUSE.sub("", query), args)
+    return row
+
+
 @app.teardown_appcontext
 def close_db(_error):
     connection = g.pop("db", None)
-    if connection is not None:
+    if connection is None:
+        return
+
+    if app.config["USE_POSTGRES"]:
         connection.close()
+    elif connection.in_transaction:
+        # The thread-local SQLite connection outlives the request; drop uncommitted work.
+        connection.rollback()
+
+
+def _schema_is_provisioned():
+    if app.config["USE_POSTGRES"]:
+        # to_regclass answers without raising, so a fresh database never aborts the transaction.
+        table_row = query_db_tuples("SELECT to_regclass('users') IS NOT NULL", one=True)
+        if not table_row[0]:
+            return False
+        return query_db_tuples("SELECT 1 FROM users LIMIT 1", one=True) is not None
+
+    try:
+        return query_db_tuples("SELECT 1 FROM users LIMIT 1", one=True) is not None
+    except sqlite3.OperationalError:
+        return False
+
+
+PORTFOLIO_REVISION_COLUMN_SQL = "ALTER TABLE portfolio_content ADD COLUMN revision INTEGER NOT NULL DEFAULT 0"
+PORTFOLIO_REVISION_BUMP_SQL = "UPDATE portfolio_content SET revision = revision + 1"
+
+# assignments.submission_count is kept current by triggers so the admin list never aggregates submissions.
+SUBMISSION_COUNT_BACKFILL_SQL = """
+UPDATE assignments
+SET submission_count = (
+    SELECT COUNT(*) FROM assignment_submissions s WHERE s.assignment_id = assignments.id
+)
+"""
+SUBMISSION_COUNT_COLUMN_SQL = "ALTER TABLE assignments ADD COLUMN submission_count INTEGER NOT NULL DEFAULT 0"
+SUBMISSION_COUNT_TRIGGER_NAMES_SQLITE = frozenset(
+    ("trg_assignment_submissions_count_insert", "trg_assignment_submissions_count_delete")
+)
+SUBMISSION_COUNT_TRIGGERS_SQLITE = (
+    """
+    CREATE TRIGGER IF NOT EXISTS trg_assignment_submissions_count_insert
+    AFTER INSERT ON assignment_submissions
+    BEGIN
+        UPDATE assignments SET submission_count = submission_count + 1 WHERE id = NEW.assignment_id;
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS trg_assignment_submissions_count_delete
+    AFTER DELETE ON assignment_submissions
+    BEGIN
+        UPDATE assignments SET submission_count = submission_count - 1 WHERE id = OLD.assignment_id;
+    END
+    """,
+)
+SUBMISSION_COUNT_MIGRATION_POSTGRES = (
+    SUBMISSION_COUNT_COLUMN_SQL,
+    SUBMISSION_COUNT_BACKFILL_SQL,
+    """
+    CREATE OR REPLACE FUNCTION assignment_submissions_count() RETURNS trigger AS $$
+    BEGIN
+        IF TG_OP = 'INSERT' THEN
+            UPDATE assignments SET submission_count = submission_count + 1 WHERE id = NEW.assignment_id;
+        ELSE
+            UPDATE assignments SET submission_count = submission_count - 1 WHERE id = OLD.assignment_id;
+        END IF;
+        RETURN NULL;
+    END
+    $$ LANGUAGE plpgsql
+    """,
+    "DROP TRIGGER IF EXISTS trg_assignment_submissions_count ON assignment_submissions",
+    """
+    CREATE TRIGGER trg_assignment_submissions_count
+    AFTER INSERT OR DELETE ON assignment_submissions
+    FOR EACH ROW EXECUTE PROCEDURE assignment_submissions_count()
+    """,
+)
+
+# Applied on every boot so databases provisioned before an index was added pick it up.
+MIGRATION_INDEX_SQL = (
+    "CREATE INDEX IF NOT EXISTS idx_assignments_target_student_created_at ON assignments (target_student_id, created_at)",
+    # Notice lists (NOTICES_SQL, PUBLIC_NOTICES_SQL): pinned first, then the CASE sort key, walked without a sort.
+    "CREATE INDEX IF NOT EXISTS idx_notices_list_order ON notices "
+    "(is_pinned, (CASE WHEN is_pinned = 1 THEN COALESCE(pinned_at, created_at) ELSE created_at END))",
+    # Superseded by idx_notices_list_order once pinned and regular notices were read in one query.
+    "DROP INDEX IF EXISTS idx_notices_is_pinned_created_at",
+    "DROP INDEX IF EXISTS idx_notices_is_pinned_pin_order",
+    # Admin lists ordered over the whole table (activity log LIMIT 80, Q&A, scores, submissions).
+    "CREATE INDEX IF NOT EXISTS idx_audit_logs_created_at ON audit_logs (created_at)",
+    "CREATE INDEX IF NOT EXISTS idx_questions_created_at ON questions (created_at)",
+    "CREATE INDEX IF NOT EXISTS idx_scores_created_at ON scores (created_at)",
+    "CREATE INDEX IF NOT EXISTS idx_assignment_submissions_updated_at ON assignment_submissions (updated_at)",
+    # Student pickers: WHERE role = 'student' ORDER BY full_name.
+    "CREATE INDEX IF NOT EXISTS idx_users_role_full_name ON users (role, full_name)",
+    # Foreign keys to users(id) without a leading index; deleting an account otherwise scans each table.
+    "CREATE INDEX IF NOT EXISTS idx_assignments_created_by ON assignments (created_by)",
+    "CREATE INDEX IF NOT EXISTS idx_scores_announced_by ON scores (announced_by)",
+    "CREATE INDEX IF NOT EXISTS idx_question_answers_admin_id ON question_answers (admin_id)",
+    "CREATE INDEX IF NOT EXISTS idx_notices_created_by ON notices (created_by)",
+    "CREATE INDEX IF NOT EXISTS idx_audit_logs_actor_admin_id ON audit_logs (actor_admin_id)",
+)
 
 
 def init_db():
     db = get_db()
-    db.executescript(SCHEMA_SQL)
+    provisioned = _schema_is_provisioned()
+    if not provisioned:
+        db.executescript(SCHEMA_SQL)
     ensure_schema_migrations()
     db.commit()
-    seed_defaults()
+    if not provisioned:
+        seed_defaults()
 
 
 def ensure_schema_migrations():
     db = get_db()
 
     if app.config["USE_POSTGRES"]:
-        assignment_column_row = query_db(
+        assignment_column_row = query_scalar(
             """
             SELECT 1
             FROM information_schema.columns
             WHERE table_name = 'assignments' AND column_name = 'target_student_id'
             LIMIT 1
-            """,
-            one=True,
+            """
         )
         if assignment_column_row is None:
             db.execute("ALTER TABLE assignments ADD COLUMN target_student_id BIGINT")
             db.commit()
 
-        portfolio_column_row = query_db(
+        portfolio_column_row = query_scalar(
             """
             SELECT 1
             FROM information_schema.columns
             WHERE table_name = 'portfolio_content' AND column_name = 'profile_image_url'
             LIMIT 1
-            """,
-            one=True,
+            """
         )
         if portfolio_column_row is None:
             db.execute("ALTER TABLE portfolio_content ADD COLUMN profile_image_url TEXT")
             db.commit()
+
+        portfolio_revision_row = query_scalar(
+            """
+            SELECT 1
+            FROM information_schema.columns
+            WHERE table_name = 'portfolio_content' AND column_name = 'revision'
+            LIMIT 1
+            """
+        )
+        if portfolio_revision_row is None:
+            db.execute(PORTFOLIO_REVISION_COLUMN_SQL)
+            db.commit()
+
+        submission_count_row = query_scalar(
+            """
+            SELECT 1
+            FROM information_schema.columns
+            WHERE table_name = 'assignments' AND column_name = 'submission_count'
+            LIMIT 1
+            """
+        )
+        if submission_count_row is None:
+            # Postgres DDL is transactional, so column, backfill and trigger land in one transaction.
+            for statement in SUBMISSION_COUNT_MIGRATION_POSTGRES:
+                db.execute(statement)
+            db.commit()
     else:
         assignment_columns = query_db("PRAGMA table_info(assignments)")
         column_names = {column["name"] for column in assignment_columns}
@@ -459,46 +887,77 @@ def ensure_schema_migrations():
             db.execute("ALTER TABLE assignments ADD COLUMN target_student_id INTEGER")
             db.commit()
 
+        if "submission_count" not in column_names:
+            db.execute(SUBMISSION_COUNT_COLUMN_SQL)
+            db.commit()
+
+        # SQLite's ALTER TABLE commits on its own, so a crash after it could leave the column without triggers.
+        # Check the triggers themselves on every boot; creating them and recounting share one transaction.
+        trigger_names = {
+            row[0]
+            for row in query_db_tuples(
+                "SELECT name FROM sqlite_master WHERE type = 'trigger' AND tbl_name = 'assignment_submissions'"
+            )
+        }
+        if not SUBMISSION_COUNT_TRIGGER_NAMES_SQLITE <= trigger_names:
+            db.execute("BEGIN IMMEDIATE")
+            for statement in SUBMISSION_COUNT_TRIGGERS_SQLITE:
+                db.execute(statement)
+            db.execute(SUBMISSION_COUNT_BACKFILL_SQL)
+            db.commit()
+
         portfolio_columns = query_db("PRAGMA table_info(portfolio_content)")
         portfolio_column_names = {column["name"] for column in portfolio_columns}
         if "profile_image_url" not in portfolio_column_names:
             db.execute("ALTER TABLE portfolio_content ADD COLUMN profile_image_url TEXT")
             db.commit()
+        if "revision" not in portfolio_column_names:
+            db.execute(PORTFOLIO_REVISION_COLUMN_SQL)
+            db.commit()
 
-    db.execute(
-        "CREATE INDEX IF NOT EXISTS idx_assignments_target_student_created_at ON assignments (target_student_id, created_at)"
-    )
+    for index_sql in MIGRATION_INDEX_SQL:
+        db.execute(index_sql)
     db.commit()
 
 
+def _seed_password_hash(env_name, default_password):
+    # A precomputed hash in the environment skips password hashing on first boot.
+    return os.environ.get(env_name, "").strip() or hash_password(default_password)
+
+
 def seed_defaults():
+    global _defaults_seeded
+    if _defaults_seeded:
+        return
+
     db = get_db()
 
-    super_admin = query_db(
-        "SELECT id FROM users WHERE role = 'super_admin' LIMIT 1",
+    super_admin_id, has_student, has_notice = query_db_tuples(
+        """
+        SELECT
+            (SELECT id FROM users WHERE role = 'super_admin' ORDER BY id LIMIT 1),
+            (SELECT 1 FROM users WHERE username = ? AND role = 'student' LIMIT 1),
+            (SELECT 1 FROM notices LIMIT 1)
+        """,
+        ("student1",),
         one=True,
     )
-    if super_admin is None:
-        db.execute(
+    if super_admin_id is None:
+        super_admin_id = db.execute(
             """
             INSERT INTO users (username, password_hash, role, full_name, email, phone, approved)
             VALUES (?, ?, 'super_admin', ?, ?, ?, 1)
             """,
             (
                 "masteradmin",
-                generate_password_hash("Master123!"),
+                _seed_password_hash("MASTER_ADMIN_PASSWORD_HASH", "Master123!"),
                 "Master Admin",
                 "master@example.com",
                 "010-0000-0000",
             ),
-        )
+        ).lastrowid
 
-    student = query_db(
-        "SELECT id FROM users WHERE username = ? AND role = 'student'",
-        ("student1",),
-        one=True,
-    )
-    if student is None:
+    if has_student is None:
         db.execute(
             """
             INSERT INTO users (
@@ -508,7 +967,7 @@ def seed_defaults():
             """,
             (
                 "student1",
-                generate_password_hash("Student123!"),
+                _seed_password_hash("STUDENT1_PASSWORD_HASH", "Student123!"),
                 "Student One",
                 "student1@example.com",
                 "010-1111-1111",
@@ -519,30 +978,24 @@ def seed_defaults():
             ),
         )
 
-    notice_count = query_db("SELECT COUNT(*) AS cnt FROM notices", one=True)
-    if notice_count["cnt"] == 0:
+    if has_notice is None:
         db.execute(
             """
             INSERT INTO notices (title, content, is_pinned, pinned_at, created_by)
-            VALUES (?, ?, 1, CURRENT_TIMESTAMP, (SELECT id FROM users WHERE role = 'super_admin' LIMIT 1))
+            VALUES (?, ?, 1, CURRENT_TIMESTAMP, ?), (?, ?, 0, NULL, ?)
             """,
             (
                 "[Pinned] Class Guide",
                 "Tutoring sessions are held twice a week. Please use the Q&A menu for questions.",
-            ),
-        )
-        db.execute(
-            """
-            INSERT INTO notices (title, content, is_pinned, created_by)
-            VALUES (?, ?, 0, (SELECT id FROM users WHERE role = 'super_admin' LIMIT 1))
-            """,
-            (
+                super_admin_id,
                 "Sample Notice",
                 "This project currently includes sample data.",
+                super_admin_id,
             ),
         )
 
     db.commit()
+    _defaults_seeded = True
 
 def ensure_db_initialized():
     global _db_initialized
@@ -559,7 +1012,7 @@ def ensure_db_initialized():
                 init_db()
                 _db_initialized = True
                 return
-            except DB_OPERATIONAL_ERRORS as exc:
+            except _db_operational_errors() as exc:
                 lowered = str(exc).lower()
                 if "locked" in lowered or "deadlock" in lowered or "serialize" in lowered:
                     last_error = exc
@@ -578,6 +1031,27 @@ def as_int(value, default=0):
         return default
 
 
+def clamp(value, low, high):
+    return low if value < low else high if value > high else value
+
+
+ADMIN_LIST_PAGE_SIZE = 50
+
+
+def current_page():
+    page = as_int(request.args.get("page"), 1)
+    return page if page > 1 else 1
+
+
+def page_window(page):
+    # One extra row tells the template whether a next page exists without a COUNT(*).
+    return ADMIN_LIST_PAGE_SIZE + 1, (page - 1) * ADMIN_LIST_PAGE_SIZE
+
+
+def split_page(rows):
+    return rows[:ADMIN_LIST_PAGE_SIZE], len(rows) > ADMIN_LIST_PAGE_SIZE
+
+
 def as_float(value, default=0.0):
     try:
         return float(value)
@@ -585,40 +1059,99 @@ def as_float(value, default=0.0):
         return default
 
 
-def ensure_admin_license_rows(admin_id):
+def hash_password(password):
+    if _password_hasher is not None:
+        return _password_hasher.hash(password)
+    return generate_password_hash(password)
+
+
+def verify_password(password_hash, password):
+    if password_hash.startswith("$argon2"):
+        if _password_hasher is None:
+            return False
+        try:
+            return _password_hasher.verify(password_hash, password)
+        except (argon2.exceptions.VerificationError, argon2.exceptions.InvalidHashError):
+            return False
+    return check_password_hash(password_hash, password)
+
+
+def upgrade_password_hash(user, password):
+    # Older werkzeug hashes are rewritten to argon2 on the next successful login.
+    if _password_hasher is None:
+        return
+    password_hash = user["password_hash"]
+    if password_hash.startswith("$argon2") and not _password_hasher.check_needs_rehash(password_hash):
+        return
+
     db = get_db()
-    for menu_key, _label in LICENSE_MENUS:
-        db.execute(
-            """
-            INSERT OR IGNORE INTO admin_licenses (admin_id, menu_key, is_enabled)
-            VALUES (?, ?, 0)
-            """,
-            (admin_id, menu_key),
-        )
+    db.execute(
+        "UPDATE users SET password_hash = ? WHERE id = ?",
+        (_password_hasher.hash(password), user["id"]),
+    )
+    db.commit()
+
+
+# Built at import so the first unknown-username attempt is not slowed by generating it.
+_DUMMY_PASSWORD_HASH = hash_password(secrets.token_hex(16))
+
+
+def reject_unknown_login(password):
+    # Spend the same hashing work as a real check so unknown usernames are not revealed by timing.
+    verify_password(_DUMMY_PASSWORD_HASH, password)
+
+
+def is_plausible_login(username, password):
+    # The caller picks these lengths, so answering them quickly reveals nothing about accounts.
+    return 0 < len(username) <= LOGIN_USERNAME_MAX_LENGTH and 0 < len(password) <= LOGIN_PASSWORD_MAX_LENGTH
 
 
-def get_admin_license_map(admin_id):
-    cache_key = f"admin_license_map_{admin_id}"
+def credential_length_error(username=None, password=None):
+    # Same bounds as is_plausible_login, so every username and password that can be saved can also log in.
+    if username is not None and len(username) > LOGIN_USERNAME_MAX_LENGTH:
+        return f"Username must be at most {LOGIN_USERNAME_MAX_LENGTH} characters."
+    if password is not None and len(password) > LOGIN_PASSWORD_MAX_LENGTH:
+        return f"Password must be at most {LOGIN_PASSWORD_MAX_LENGTH} characters."
+    return None
+
+
+def _parse_json_list(raw_value):
+    # psycopg2 decodes jsonb itself; SQLite hands back the JSON text.
+    if isinstance(raw_value, str):
+        return _json_loads(raw_value)
+    return raw_value or []
+
+
+@lru_cache(maxsize=256)
+def _license_seed_params(admin_id):
+    return tuple(value for menu_key in LICENSE_MENU_KEYS for value in (admin_id, menu_key))
+
+
+def ensure_admin_license_rows(admin_id):
+    get_db().execute(LICENSE_ROWS_SEED_SQL, _license_seed_params(admin_id))
+
+
+def get_admin_license_set(admin_id):
+    cache_key = f"admin_license_set_{admin_id}"
     cached = g.get(cache_key)
     if cached is not None:
         return cached
 
-    rows = query_db(
+    rows = query_db_tuples(
         """
-        SELECT menu_key, is_enabled
+        SELECT menu_key
         FROM admin_licenses
-        WHERE admin_id = ?
+        WHERE admin_id = ? AND is_enabled = 1
         """,
         (admin_id,),
     )
-    license_map = {row["menu_key"]: row["is_enabled"] for row in rows}
-    g[cache_key] = license_map
-    return license_map
+    license_set = frozenset(row[0] for row in rows)
+    setattr(g, cache_key, license_set)
+    return license_set
 
 
 def has_license(admin_id, menu_key):
-    license_map = get_admin_license_map(admin_id)
-    return bool(license_map.get(menu_key, 0) == 1)
+    return menu_key in get_admin_license_set(admin_id)
 
 
 def get_student_user():
@@ -638,6 +1171,38 @@ def get_student_user():
     return g.student_user
 
 
+ENABLED_MENUS_SUBQUERY_SQLITE = """
+(
+    SELECT json_group_array(al.menu_key)
+    FROM admin_licenses al
+    WHERE al.admin_id = u.id AND al.is_enabled = 1
+)
+"""
+
+ENABLED_MENUS_SUBQUERY_POSTGRES = """
+(
+    SELECT COALESCE(jsonb_agg(al.menu_key), '[]'::jsonb)
+    FROM admin_licenses al
+    WHERE al.admin_id = u.id AND al.is_enabled = 1
+)
+"""
+
+ENABLED_MENUS_SUBQUERY = ENABLED_MENUS_SUBQUERY_POSTGRES if app.config["USE_POSTGRES"] else ENABLED_MENUS_SUBQUERY_SQLITE
+
+ADMIN_CONTEXT_SQL = f"""
+SELECT u.*, {ENABLED_MENUS_SUBQUERY} AS enabled_menus
+FROM users u
+WHERE u.id = ? AND u.role IN ('admin', 'super_admin')
+"""
+
+
+def _load_admin_context(admin_id):
+    admin = query_db(ADMIN_CONTEXT_SQL, (admin_id,), one=True)
+    if admin is not None:
+        setattr(g, f"admin_license_set_{admin['id']}", frozenset(_parse_json_list(admin["enabled_menus"])))
+    return admin
+
+
 def get_admin_user():
     if "admin_user" in g:
         return g.admin_user
@@ -647,11 +1212,7 @@ def get_admin_user():
         g.admin_user = None
         return None
 
-    g.admin_user = query_db(
-        "SELECT * FROM users WHERE id = ? AND role IN ('admin', 'super_admin')",
-        (admin_id,),
-        one=True,
-    )
+    g.admin_user = _load_admin_context(admin_id)
     return g.admin_user
 
 
@@ -708,97 +1269,242 @@ def admin_required(menu_key=None, super_admin_only=False):
     return decorator
 
 
+AUDIT_LOG_INSERT_SQL = """
+INSERT INTO audit_logs (actor_admin_id, menu_key, action_type, target_type, target_id, detail)
+VALUES (?, ?, ?, ?, ?, ?)
+"""
+
+
+def _write_audit_log_batch(batch):
+    with app.app_context():
+        db = get_db()
+        try:
+            for row in batch:
+                db.execute(AUDIT_LOG_INSERT_SQL, row)
+            db.commit()
+        except _db_integrity_errors():
+            # The acting admin was deleted before the row was written; keep the record like ON DELETE SET NULL would.
+            db.rollback()
+            for row in batch:
+                try:
+                    db.execute(AUDIT_LOG_INSERT_SQL, row)
+                except _db_integrity_errors():
+                    db.rollback()
+                    db.execute(AUDIT_LOG_INSERT_SQL, (None, *row[1:]))
+                db.commit()
+        except Exception:
+            db.rollback()
+            raise
+
+
+def _audit_log_worker():
+    batch = []
+    while True:
+        if not batch:
+            batch.append(_audit_log_queue.get())
+        while len(batch) < AUDIT_LOG_BATCH_SIZE:
+            try:
+                batch.append(_audit_log_queue.get_nowait())
+            except queue.Empty:
+                break
+
+        try:
+            _write_audit_log_batch(batch)
+        except Exception:
+            # Rows stay in the batch and are retried, so a locked or briefly unreachable database loses nothing.
+            app.logger.exception("Failed to write %d audit log rows; retrying", len(batch))
+            time.sleep(AUDIT_LOG_RETRY_DELAY_SECONDS)
+            continue
+
+        for _row in batch:
+            _audit_log_queue.task_done()
+        batch = []
+
+
+def _ensure_audit_log_writer():
+    global _audit_log_writer
+    if _audit_log_writer is not None and _audit_log_writer.is_alive():
+        return
+
+    with _audit_log_writer_lock:
+        if _audit_log_writer is None or not _audit_log_writer.is_alive():
+            _audit_log_writer = threading.Thread(target=_audit_log_worker, name="audit-log-writer", daemon=True)
+            _audit_log_writer.start()
+
+
+def flush_audit_logs():
+    # Waits for queued rows to be written, but gives up after a bound so a dead database cannot block shutdown.
+    if _audit_log_writer is None:
+        return
+    deadline = time.monotonic() + AUDIT_LOG_FLUSH_TIMEOUT_SECONDS
+    while _audit_log_queue.unfinished_tasks and time.monotonic() < deadline:
+        time.sleep(0.05)
+    if _audit_log_queue.unfinished_tasks:
+        app.logger.error("%d audit log rows were not written before shutdown", _audit_log_queue.unfinished_tasks)
+
+
+atexit.register(flush_audit_logs)
+
+
 def log_admin_action(menu_key, action_type, target_type, target_id, detail):
     admin = get_admin_user()
     if admin is None:
         return
 
+    row = (admin["id"], menu_key, action_type, target_type, target_id, detail)
+    if app.config["AUDIT_LOG_ASYNC"]:
+        _ensure_audit_log_writer()
+        _audit_log_queue.put(row)
+        return
+
     db = get_db()
-    db.execute(
-        """
-        INSERT INTO audit_logs (actor_admin_id, menu_key, action_type, target_type, target_id, detail)
-        VALUES (?, ?, ?, ?, ?, ?)
-        """,
-        (admin["id"], menu_key, action_type, target_type, target_id, detail),
-    )
+    db.execute(AUDIT_LOG_INSERT_SQL, row)
     db.commit()
 
 
+ANSWERS_JSON_SUBQUERY_SQLITE = """
+(
+    SELECT json_group_array(
+        json_object(
+            'id', qa.id,
+            'question_id', qa.question_id,
+            'admin_id', qa.admin_id,
+            'content', qa.content,
+            'created_at', qa.created_at,
+            'updated_at', qa.updated_at,
+            'admin_name', qa.admin_name,
+            'admin_username', qa.admin_username
+        )
+    )
+    FROM (
+        SELECT a.*, au.full_name AS admin_name, au.username AS admin_username
+        FROM question_answers a
+        LEFT JOIN users au ON au.id = a.admin_id
+        WHERE a.question_id = q.id
+        ORDER BY a.created_at ASC
+    ) qa
+)
+"""
+
+ANSWERS_JSON_SUBQUERY_POSTGRES = """
+(
+    SELECT COALESCE(
+        jsonb_agg(
+            jsonb_build_object(
+                'id', a.id,
+                'question_id', a.question_id,
+                'admin_id', a.admin_id,
+                'content', a.content,
+                'created_at', a.created_at::text,
+                'updated_at', a.updated_at::text,
+                'admin_name', au.full_name,
+                'admin_username', au.username
+            )
+            ORDER BY a.created_at ASC
+        ),
+        '[]'::jsonb
+    )
+    FROM question_answers a
+    LEFT JOIN users au ON au.id = a.admin_id
+    WHERE a.question_id = q.id
+)
+"""
+
+ANSWERS_JSON_SUBQUERY = ANSWERS_JSON_SUBQUERY_POSTGRES if app.config["USE_POSTGRES"] else ANSWERS_JSON_SUBQUERY_SQLITE
+
+# Built once so every call hands the driver the same statement text.
+PUBLIC_QUESTIONS_SQL = f"""
+SELECT q.*, u.full_name AS student_name, u.username AS student_username,
+    {ANSWERS_JSON_SUBQUERY} AS answers_json
+FROM questions q
+JOIN users u ON u.id = q.student_id
+WHERE q.is_public = 1
+ORDER BY q.created_at DESC
+"""
+
+STUDENT_VISIBLE_QUESTIONS_SQL = f"""
+SELECT q.*, u.full_name AS student_name, u.username AS student_username,
+    {ANSWERS_JSON_SUBQUERY} AS answers_json
+FROM questions q
+JOIN users u ON u.id = q.student_id
+WHERE q.is_public = 1 OR q.student_id = ?
+ORDER BY q.created_at DESC
+"""
+
+
 def fetch_questions_for_student(student_id):
     if student_id is None:
-        questions = query_db(
-            """
-            SELECT q.*, u.full_name AS student_name, u.username AS student_username
-            FROM questions q
-            JOIN users u ON u.id = q.student_id
-            WHERE q.is_public = 1
-            ORDER BY q.created_at DESC
-            """
-        )
+        questions = query_db(PUBLIC_QUESTIONS_SQL)
     else:
-        questions = query_db(
-            """
-            SELECT q.*, u.full_name AS student_name, u.username AS student_username
-            FROM questions q
-            JOIN users u ON u.id = q.student_id
-            WHERE q.is_public = 1 OR q.student_id = ?
-            ORDER BY q.created_at DESC
-            """,
-            (student_id,),
-        )
+        questions = query_db(STUDENT_VISIBLE_QUESTIONS_SQL, (student_id,))
 
-    question_ids = [question["id"] for question in questions]
     answers_by_question = {}
-
-    if question_ids:
-        placeholders = ",".join(["?"] * len(question_ids))
-        answers = query_db(
-            f"""
-            SELECT a.*, u.full_name AS admin_name, u.username AS admin_username
-            FROM question_answers a
-            LEFT JOIN users u ON u.id = a.admin_id
-            WHERE a.question_id IN ({placeholders})
-            ORDER BY a.created_at ASC
-            """,
-            tuple(question_ids),
-        )
-        for answer in answers:
-            answers_by_question.setdefault(answer["question_id"], []).append(answer)
+    for question in questions:
+        answers = _parse_json_list(question["answers_json"])
+        if answers:
+            answers_by_question[question["id"]] = answers
 
     return questions, answers_by_question
 
 
-def fetch_notices():
-    pinned = query_db(
-        """
-        SELECT n.*, u.full_name AS admin_name
-        FROM notices n
-        LEFT JOIN users u ON u.id = n.created_by
-        WHERE n.is_pinned = 1
-        ORDER BY COALESCE(n.pinned_at, n.created_at) DESC
-        """
-    )
+def fetch_dashboard_counts():
+    now = time.monotonic()
+    with _dashboard_counts_lock:
+        counts = _dashboard_counts["value"]
+        if counts is not None and now - _dashboard_counts["checked_at"] < DASHBOARD_COUNTS_TTL_SECONDS:
+            return counts
 
-    regular = query_db(
-        """
-        SELECT n.*, u.full_name AS admin_name
-        FROM notices n
-        LEFT JOIN users u ON u.id = n.created_by
-        WHERE n.is_pinned = 0
-        ORDER BY n.created_at DESC
+    count_row = query_db(
         """
+        SELECT
+            (SELECT COUNT(*) FROM users WHERE role = 'student') AS students,
+            (SELECT COUNT(*) FROM questions) AS questions,
+            (SELECT COUNT(*) FROM assignments) AS assignments,
+            (SELECT COUNT(*) FROM notices) AS notices
+        """,
+        one=True,
     )
+    counts = MappingProxyType(dict(count_row))
+
+    with _dashboard_counts_lock:
+        _dashboard_counts["value"] = counts
+        _dashboard_counts["checked_at"] = now
+    return counts
+
+
+NOTICES_SQL = """
+SELECT n.*, u.full_name AS admin_name
+FROM notices n
+LEFT JOIN users u ON u.id = n.created_by
+ORDER BY
+    n.is_pinned DESC,
+    CASE WHEN n.is_pinned = 1 THEN COALESCE(n.pinned_at, n.created_at) ELSE n.created_at END DESC
+"""
+
+
+def fetch_notices(limit_regular=None):
+    # Pinned rows come first, so reading stops as soon as the regular list is full.
+    pinned = []
+    regular = []
+    rows = query_db_iter(NOTICES_SQL)
+    for row in rows:
+        if row["is_pinned"] == 1:
+            pinned.append(row)
+            continue
+        if len(regular) == limit_regular:
+            break
+        regular.append(row)
+    rows.close()
 
     return pinned, regular
 
 
+def _strip_text(value):
+    return value.strip() if isinstance(value, str) else str(value).strip()
+
+
 def _normalize_string_list(items):
-    normalized = []
-    for item in items:
-        text = str(item).strip()
-        if text:
-            normalized.append(text)
-    return normalized
+    return [text for text in map(_strip_text, items) if text]
 
 
 def _normalize_projects(items):
@@ -806,8 +1512,8 @@ def _normalize_projects(items):
     for item in items:
         if not isinstance(item, dict):
             continue
-        title = str(item.get("title", "")).strip()
-        summary = str(item.get("summary", "")).strip()
+        title = _strip_text(item.get("title", ""))
+        summary = _strip_text(item.get("summary", ""))
         if title and summary:
             normalized.append({"title": title, "summary": summary})
     return normalized
@@ -818,7 +1524,7 @@ def _parse_portfolio_json(raw_json, fallback, normalize_fn):
         return fallback
 
     try:
-        parsed = json.loads(raw_json)
+        parsed = _json_loads(raw_json)
     except (TypeError, ValueError):
         return fallback
 
@@ -859,8 +1565,8 @@ def ensure_portfolio_content_row():
             PORTFOLIO_DEFAULT_PROFILE["github"],
             PORTFOLIO_DEFAULT_PROFILE["location"],
             PORTFOLIO_DEFAULT_PROFILE_IMAGE_URL,
-            json.dumps(PORTFOLIO_DEFAULT_SKILLS, ensure_ascii=False),
-            json.dumps(PORTFOLIO_DEFAULT_PROJECTS, ensure_ascii=False),
+            _json_dumps(PORTFOLIO_DEFAULT_SKILLS),
+            _json_dumps(PORTFOLIO_DEFAULT_PROJECTS),
         ),
     )
     db.commit()
@@ -870,48 +1576,132 @@ def ensure_portfolio_content_row():
     )
 
 
+# updated_at only has one-second resolution, so two writes within the same second from another
+# worker process would leave the key unchanged. Every app write that feeds the payload also bumps
+# portfolio_content.revision, which makes the key change across processes; edits made outside the
+# app are still only picked up through updated_at and the cache TTL.
+def _portfolio_cache_key():
+    rows = query_db_tuples(
+        """
+        SELECT 'content' AS source, pc.revision, pc.updated_at
+        FROM (SELECT revision, updated_at FROM portfolio_content ORDER BY id ASC LIMIT 1) pc
+        UNION ALL
+        SELECT 'owner' AS source, 0, ou.updated_at
+        FROM (SELECT updated_at FROM users WHERE role = 'super_admin' ORDER BY id ASC LIMIT 1) ou
+        """
+    )
+    return tuple(rows)
+
+
+def invalidate_portfolio_cache():
+    with _portfolio_cache_lock:
+        _portfolio_cache["key"] = None
+        _portfolio_cache["payload"] = None
+        _portfolio_cache["checked_at"] = 0.0
+        _portfolio_cache["body"] = None
+        _portfolio_cache["etag"] = None
+
+
 def build_portfolio_payload():
+    now = time.monotonic()
+    with _portfolio_cache_lock:
+        payload = _portfolio_cache["payload"]
+        if payload is not None and now - _portfolio_cache["checked_at"] < PORTFOLIO_CACHE_TTL_SECONDS:
+            return payload
+
+    cache_key = _portfolio_cache_key()
+    with _portfolio_cache_lock:
+        if _portfolio_cache["key"] == cache_key and _portfolio_cache["payload"] is not None:
+            _portfolio_cache["checked_at"] = now
+            return _portfolio_cache["payload"]
+
+    payload = _load_portfolio_payload()
+    with _portfolio_cache_lock:
+        _portfolio_cache["key"] = cache_key
+        _portfolio_cache["payload"] = payload
+        _portfolio_cache["checked_at"] = now
+        _portfolio_cache["body"] = None
+        _portfolio_cache["etag"] = None
+    return payload
+
+
+def build_portfolio_json():
+    # Encoded body and ETag are reused for as long as the cached payload object is.
+    payload = build_portfolio_payload()
+    with _portfolio_cache_lock:
+        if _portfolio_cache["payload"] is payload and _portfolio_cache["body"] is not None:
+            return _portfolio_cache["body"], _portfolio_cache["etag"]
+
+    body = (app.json.dumps(payload) + "\n").encode("utf-8")
+    etag = generate_etag(body)
+    with _portfolio_cache_lock:
+        if _portfolio_cache["payload"] is payload:
+            _portfolio_cache["body"] = body
+            _portfolio_cache["etag"] = etag
+    return body, etag
+
+
+# (row column, payload key) pairs; blank column values keep the default.
+_PORTFOLIO_CONTENT_NOTE_FIELDS = (
+    ("about_note", "about_note"),
+    ("skills_note", "skills_note"),
+    ("contact_note", "contact_note"),
+)
+_PORTFOLIO_CONTENT_PROFILE_FIELDS = (
+    ("github", "github"),
+    ("location", "location"),
+)
+_PORTFOLIO_OWNER_PROFILE_FIELDS = (
+    ("full_name", "name"),
+    ("education", "education"),
+    ("certificates", "certificates"),
+    ("email", "email"),
+    ("phone", "phone"),
+    ("bio", "intro"),
+)
+
+
+def _apply_text_fields(target, row, fields):
+    for column, key in fields:
+        # SQLite's loose typing can hand back numbers here, so coerce before stripping.
+        value = str(row[column] or "").strip()
+        if value:
+            target[key] = value
+
+
+def _load_portfolio_payload():
     profile = dict(PORTFOLIO_DEFAULT_PROFILE)
-    about_note = PORTFOLIO_DEFAULT_ABOUT_NOTE
-    skills_note = PORTFOLIO_DEFAULT_SKILLS_NOTE
-    contact_note = PORTFOLIO_DEFAULT_CONTACT_NOTE
+    notes = {
+        "about_note": PORTFOLIO_DEFAULT_ABOUT_NOTE,
+        "skills_note": PORTFOLIO_DEFAULT_SKILLS_NOTE,
+        "contact_note": PORTFOLIO_DEFAULT_CONTACT_NOTE,
+    }
     profile_image_url = PORTFOLIO_DEFAULT_PROFILE_IMAGE_URL
-    skills = list(PORTFOLIO_DEFAULT_SKILLS)
-    projects = [dict(project) for project in PORTFOLIO_DEFAULT_PROJECTS]
+    skills = _PORTFOLIO_DEFAULT_SKILLS_FROZEN
+    projects = _PORTFOLIO_DEFAULT_PROJECTS_FROZEN
 
     content_row = ensure_portfolio_content_row()
     if content_row is not None:
-        about_note_text = (content_row["about_note"] or "").strip()
-        if about_note_text:
-            about_note = about_note_text
-
-        skills_note_text = (content_row["skills_note"] or "").strip()
-        if skills_note_text:
-            skills_note = skills_note_text
-
-        contact_note_text = (content_row["contact_note"] or "").strip()
-        if contact_note_text:
-            contact_note = contact_note_text
-
-        github = (content_row["github"] or "").strip()
-        if github:
-            profile["github"] = github
+        _apply_text_fields(notes, content_row, _PORTFOLIO_CONTENT_NOTE_FIELDS)
+        _apply_text_fields(profile, content_row, _PORTFOLIO_CONTENT_PROFILE_FIELDS)
 
-        location = (content_row["location"] or "").strip()
-        if location:
-            profile["location"] = location
-
         skills = _parse_portfolio_json(
-            content_row["skills_json"],
-            list(PORTFOLIO_DEFAULT_SKILLS),
-            _normalize_string_list,
+            content_row["skills_json"],
+            _PORTFOLIO_DEFAULT_SKILLS_FROZEN,
+            _normalize_string_list,
         )
         projects = _parse_portfolio_json(
             content_row["projects_json"],
-            [dict(project) for project in PORTFOLIO_DEFAULT_PROJECTS],
+            _PORTFOLIO_DEFAULT_PROJECTS_FROZEN,
             _normalize_projects,
         )
 
+    # Defaults stay frozen until here; the payload itself must be plain JSON-serializable data.
+    if skills is _PORTFOLIO_DEFAULT_SKILLS_FROZEN:
+        skills = list(skills)
+    if projects is _PORTFOLIO_DEFAULT_PROJECTS_FROZEN:
+        projects = [dict(project) for project in projects]
+
     owner = query_db(
         """
         SELECT full_name, age, education, certificates, email, phone, bio
@@ -924,41 +1714,18 @@ def build_portfolio_payload():
     )
 
     if owner is not None:
-        full_name = (owner["full_name"] or "").strip()
-        if full_name:
-            profile["name"] = full_name
-
+        _apply_text_fields(profile, owner, _PORTFOLIO_OWNER_PROFILE_FIELDS)
         if owner["age"] is not None:
             profile["age"] = owner["age"]
 
-        education = (owner["education"] or "").strip()
-        if education:
-            profile["education"] = education
-
-        certificates = (owner["certificates"] or "").strip()
-        if certificates:
-            profile["certificates"] = certificates
-
-        email = (owner["email"] or "").strip()
-        if email:
-            profile["email"] = email
-
-        phone = (owner["phone"] or "").strip()
-        if phone:
-            profile["phone"] = phone
-
-        intro = (owner["bio"] or "").strip()
-        if intro:
-            profile["intro"] = intro
-
-    return {
-        "profile": profile,
-        "profile_image_url": profile_image_url,
-        "skills": skills,
-        "projects": projects,
-        "about_note": about_note,
-        "skills_note": skills_note,
-        "contact_note": contact_note,
+    return {
+        "profile": profile,
+        "profile_image_url": profile_image_url,
+        "skills": skills,
+        "projects": projects,
+        "about_note": notes["about_note"],
+        "skills_note": notes["skills_note"],
+        "contact_note": notes["contact_note"],
     }
 
 
@@ -969,26 +1736,25 @@ def inject_users():
         "admin_user": get_admin_user(),
         "license_menus": LICENSE_MENUS,
         "admin_can_access": admin_can_access,
-        "asset_version": ASSET_VERSION,
+        "asset_version": get_asset_version(),
     }
 
 
-@app.before_request
-def boot_db_once():
-    ensure_db_initialized()
-
-
 @app.after_request
-def disable_static_cache(response):
+def add_response_headers(response):
     if request.path.startswith("/static/"):
-        response.headers["Cache-Control"] = "no-store, no-cache, must-revalidate, max-age=0"
-        response.headers["Pragma"] = "no-cache"
-        response.headers["Expires"] = "0"
+        if "v" in request.args and response.status_code == 200:
+            # Templates link assets with ?v=asset_version, so a changed file is always requested under a new URL.
+            # Only real hits are pinned; a 404 for a mistyped or not-yet-deployed asset must not stick for a year.
+            response.headers["Cache-Control"] = "public, max-age=31536000, immutable"
+        else:
+            # Unversioned paths revalidate and are answered with 304 while unchanged.
+            response.headers["Cache-Control"] = "no-cache"
     if request.path.startswith("/api/"):
         allow_origin = app.config.get("CORS_ALLOW_ORIGIN", "*")
         response.headers["Access-Control-Allow-Origin"] = allow_origin
-        response.headers["Access-Control-Allow-Methods"] = "GET, POST, PUT, PATCH, DELETE, OPTIONS"
-        response.headers["Access-Control-Allow-Headers"] = "Content-Type, Authorization"
+        response.headers["Access-Control-Allow-Methods"] = API_CORS_ALLOW_METHODS
+        response.headers["Access-Control-Allow-Headers"] = API_CORS_ALLOW_HEADERS
     return response
 
 
@@ -1016,6 +1782,40 @@ def api_preflight(_path):
     return "", 204
 
 
+API_CORS_ALLOW_METHODS = "GET, POST, PUT, PATCH, DELETE, OPTIONS"
+API_CORS_ALLOW_HEADERS = "Content-Type, Authorization"
+HEALTHZ_BODY = b'{"status":"ok"}\n'
+
+
+def _fast_path_middleware(wsgi_app):
+    # Load-balancer probes and CORS preflights are answered before Flask builds a request context.
+    def middleware(environ, start_response):
+        method = environ.get("REQUEST_METHOD")
+        path = environ.get("PATH_INFO", "")
+        if method == "OPTIONS" and path.startswith("/api/") and len(path) > 5:
+            start_response(
+                "204 NO CONTENT",
+                [
+                    ("Access-Control-Allow-Origin", app.config.get("CORS_ALLOW_ORIGIN", "*")),
+                    ("Access-Control-Allow-Methods", API_CORS_ALLOW_METHODS),
+                    ("Access-Control-Allow-Headers", API_CORS_ALLOW_HEADERS),
+                ],
+            )
+            return [b""]
+        if method == "GET" and path == "/healthz":
+            start_response(
+                "200 OK",
+                [("Content-Type", "application/json"), ("Content-Length", str(len(HEALTHZ_BODY)))],
+            )
+            return [HEALTHZ_BODY]
+        return wsgi_app(environ, start_response)
+
+    return middleware
+
+
+app.wsgi_app = _fast_path_middleware(app.wsgi_app)
+
+
 @app.get("/api/healthz")
 def api_healthz():
     return {
@@ -1027,28 +1827,42 @@ def api_healthz():
 
 @app.get("/api/portfolio")
 def api_portfolio():
-    return build_portfolio_payload(), 200
-
-
-def _serialize_notice_row(notice):
-    return {
-        "id": notice["id"],
-        "title": notice["title"],
-        "content": notice["content"],
-        "is_pinned": bool(notice["is_pinned"]),
-        "created_at": notice["created_at"],
-        "updated_at": notice["updated_at"],
-        "admin_name": notice["admin_name"] if notice["admin_name"] else "",
-    }
+    body, etag = build_portfolio_json()
+    response = app.response_class(body, mimetype="application/json")
+    response.set_etag(etag)
+    return response.make_conditional(request)
+
+
+PUBLIC_NOTICES_SQL = """
+SELECT
+    n.id,
+    n.title,
+    n.content,
+    n.is_pinned,
+    n.created_at,
+    n.updated_at,
+    COALESCE(u.full_name, '') AS admin_name
+FROM notices n
+LEFT JOIN users u ON u.id = n.created_by
+ORDER BY
+    n.is_pinned DESC,
+    CASE WHEN n.is_pinned = 1 THEN COALESCE(n.pinned_at, n.created_at) ELSE n.created_at END DESC
+"""
 
 
 @app.get("/api/notices/public")
 def api_notices_public():
-    pinned_notices, regular_notices = fetch_notices()
-    return {
-        "pinned": [_serialize_notice_row(n) for n in pinned_notices],
-        "regular": [_serialize_notice_row(n) for n in regular_notices],
-    }, 200
+    pinned = []
+    regular = []
+    for row in query_db(PUBLIC_NOTICES_SQL):
+        notice = dict(row)
+        if notice["is_pinned"] == 1:
+            notice["is_pinned"] = True
+            pinned.append(notice)
+        else:
+            notice["is_pinned"] = False
+            regular.append(notice)
+    return {"pinned": pinned, "regular": regular}, 200
 
 
 @app.route("/portfolio")
@@ -1069,36 +1883,41 @@ def portfolio():
 @app.route("/tutoring")
 def tutoring_home():
     student = get_student_user()
-    pinned_notices, regular_notices = fetch_notices()
+    pinned_notices, regular_notices = fetch_notices(limit_regular=5)
 
     assignment_summary = None
     score_summary = None
     if student is not None:
-        assignment_summary = query_db(
-            """
-            SELECT COUNT(*) AS total, COALESCE(AVG(progress), 0) AS avg_progress
-            FROM assignment_submissions
-            WHERE student_id = ?
-            """,
-            (student["id"],),
-            one=True,
-        )
-        score_summary = query_db(
+        summary_row = query_db(
             """
             SELECT
-                COUNT(*) AS total,
-                COALESCE(AVG((score * 100.0) / NULLIF(max_score, 0)), 0) AS avg_rate
-            FROM scores
-            WHERE student_id = ?
+                a.total AS assignment_total,
+                a.avg_progress,
+                s.total AS score_total,
+                s.avg_rate
+            FROM (
+                SELECT COUNT(*) AS total, COALESCE(AVG(progress), 0) AS avg_progress
+                FROM assignment_submissions
+                WHERE student_id = ?
+            ) a
+            CROSS JOIN (
+                SELECT
+                    COUNT(*) AS total,
+                    COALESCE(AVG((score * 100.0) / NULLIF(max_score, 0)), 0) AS avg_rate
+                FROM scores
+                WHERE student_id = ?
+            ) s
             """,
-            (student["id"],),
+            (student["id"], student["id"]),
             one=True,
         )
+        assignment_summary = {"total": summary_row["assignment_total"], "avg_progress": summary_row["avg_progress"]}
+        score_summary = {"total": summary_row["score_total"], "avg_rate": summary_row["avg_rate"]}
 
     return render_template(
         "tutoring/home.html",
         pinned_notices=pinned_notices,
-        regular_notices=regular_notices[:5],
+        regular_notices=regular_notices,
         assignment_summary=assignment_summary,
         score_summary=score_summary,
     )
@@ -1107,19 +1926,23 @@ def tutoring_home():
 @app.route("/tutoring/login", methods=["GET", "POST"])
 def tutoring_login():
     if request.method == "POST":
-        username = request.form.get("username", "").strip()
-        password = request.form.get("password", "")
+        form = request.form
+        username = form.get("username", "").strip()
+        password = form.get("password", "")
 
-        student = query_db(
-            "SELECT * FROM users WHERE username = ? AND role = 'student'",
-            (username,),
-            one=True,
-        )
-
-        if student and check_password_hash(student["password_hash"], password):
-            session["student_id"] = student["id"]
-            flash("Logged in.", "success")
-            return redirect(url_for("tutoring_home"))
+        if is_plausible_login(username, password):
+            student = query_db(
+                "SELECT id, password_hash FROM users WHERE username = ? AND role = 'student'",
+                (username,),
+                one=True,
+            )
+            if student is None:
+                reject_unknown_login(password)
+            elif verify_password(student["password_hash"], password):
+                upgrade_password_hash(student, password)
+                session["student_id"] = student["id"]
+                flash("Logged in.", "success")
+                return redirect(url_for("tutoring_home"))
 
         flash("Invalid username or password.", "danger")
 
@@ -1139,41 +1962,44 @@ def tutoring_profile():
     student = get_student_user()
 
     if request.method == "POST":
-        full_name = request.form.get("full_name", "").strip()
-        email = request.form.get("email", "").strip()
-        phone = request.form.get("phone", "").strip()
-        age = as_int(request.form.get("age"), 0)
-        education = request.form.get("education", "").strip()
-        certificates = request.form.get("certificates", "").strip()
-        bio = request.form.get("bio", "").strip()
-        new_password = request.form.get("new_password", "")
+        form = request.form
+        full_name = form.get("full_name", "").strip()
+        email = form.get("email", "").strip()
+        phone = form.get("phone", "").strip()
+        age = as_int(form.get("age"), 0)
+        education = form.get("education", "").strip()
+        certificates = form.get("certificates", "").strip()
+        bio = form.get("bio", "").strip()
+        new_password = form.get("new_password", "")
 
         if not full_name:
             flash("Name is required.", "danger")
             return redirect(url_for("tutoring_profile"))
 
+        credential_error = credential_length_error(password=new_password)
+        if credential_error:
+            flash(credential_error, "danger")
+            return redirect(url_for("tutoring_profile"))
+
+        # Hash before the first UPDATE so the write lock is not held during hashing.
+        new_password_hash = hash_password(new_password) if new_password else None
         db = get_db()
         db.execute(
             """
             UPDATE users
-            SET full_name = ?, email = ?, phone = ?, age = ?, education = ?, certificates = ?, bio = ?, updated_at = CURRENT_TIMESTAMP
+            SET
+                full_name = ?, email = ?, phone = ?, age = ?, education = ?, certificates = ?, bio = ?,
+                password_hash = COALESCE(?, password_hash),
+                updated_at = CURRENT_TIMESTAMP
             WHERE id = ?
             """,
-            (full_name, email, phone, age, education, certificates, bio, student["id"]),
+            (full_name, email, phone, age, education, certificates, bio, new_password_hash, student["id"]),
         )
 
-        if new_password:
-            db.execute(
-                "UPDATE users SET password_hash = ?, updated_at = CURRENT_TIMESTAMP WHERE id = ?",
-                (generate_password_hash(new_password), student["id"]),
-            )
-
         db.commit()
         flash("Profile has been updated.", "success")
         return redirect(url_for("tutoring_profile"))
 
-    student = query_db("SELECT * FROM users WHERE id = ?", (student["id"],), one=True)
-    g.student_user = student
     return render_template("tutoring/profile.html", student=student)
 
 
@@ -1182,13 +2008,14 @@ def tutoring_qna():
     student = get_student_user()
 
     if request.method == "POST":
+        form = request.form
         if student is None:
             flash("Login is required to post a question.", "warning")
             return redirect(url_for("tutoring_login"))
 
-        title = request.form.get("title", "").strip()
-        content = request.form.get("content", "").strip()
-        is_public = 1 if request.form.get("is_public") == "on" else 0
+        title = form.get("title", "").strip()
+        content = form.get("content", "").strip()
+        is_public = 1 if form.get("is_public") == "on" else 0
 
         if not title or not content:
             flash("Title and content are required.", "danger")
@@ -1218,20 +2045,16 @@ def tutoring_qna():
 @student_required
 def tutoring_edit_question(question_id):
     student = get_student_user()
-    question = query_db(
-        "SELECT * FROM questions WHERE id = ?",
-        (question_id,),
-        one=True,
-    )
-
-    if question is None:
+    owner_id = query_scalar("SELECT student_id FROM questions WHERE id = ?", (question_id,))
+    if owner_id is None:
         abort(404)
-    if question["student_id"] != student["id"]:
+    if owner_id != student["id"]:
         abort(403)
 
-    title = request.form.get("title", "").strip()
-    content = request.form.get("content", "").strip()
-    is_public = 1 if request.form.get("is_public") == "on" else 0
+    form = request.form
+    title = form.get("title", "").strip()
+    content = form.get("content", "").strip()
+    is_public = 1 if form.get("is_public") == "on" else 0
 
     if not title or not content:
         flash("Title and content are required.", "danger")
@@ -1255,15 +2078,10 @@ def tutoring_edit_question(question_id):
 @student_required
 def tutoring_delete_question(question_id):
     student = get_student_user()
-    question = query_db(
-        "SELECT * FROM questions WHERE id = ?",
-        (question_id,),
-        one=True,
-    )
-
-    if question is None:
+    owner_id = query_scalar("SELECT student_id FROM questions WHERE id = ?", (question_id,))
+    if owner_id is None:
         abort(404)
-    if question["student_id"] != student["id"]:
+    if owner_id != student["id"]:
         abort(403)
 
     db = get_db()
@@ -1278,19 +2096,19 @@ def tutoring_assignments():
     student = get_student_user()
 
     if request.method == "POST":
-        assignment_id = as_int(request.form.get("assignment_id"), 0)
-        content = request.form.get("content", "").strip()
-        progress = max(0, min(100, as_int(request.form.get("progress"), 0)))
+        form = request.form
+        assignment_id = as_int(form.get("assignment_id"), 0)
+        content = form.get("content", "").strip()
+        progress = clamp(as_int(form.get("progress"), 0), 0, 100)
         status = "completed" if progress >= 100 else "in-progress"
 
-        assignment = query_db(
+        assignment = query_scalar(
             """
             SELECT id
             FROM assignments
             WHERE id = ? AND (target_student_id IS NULL OR target_student_id = ?)
             """,
             (assignment_id, student["id"]),
-            one=True,
         )
         if assignment is None:
             flash("You can only submit assignments assigned to you.", "danger")
@@ -1317,16 +2135,15 @@ def tutoring_assignments():
     assignments = query_db(
         """
         SELECT
-            a.*,
-            u.full_name AS target_student_name,
-            u.username AS target_student_username,
-            s.id AS submission_id,
+            a.id,
+            a.title,
+            a.description,
+            a.due_date,
+            a.target_student_id,
             s.content AS submission_content,
             s.progress AS submission_progress,
-            s.status AS submission_status,
             s.updated_at AS submission_updated_at
         FROM assignments a
-        LEFT JOIN users u ON u.id = a.target_student_id
         LEFT JOIN assignment_submissions s
             ON s.assignment_id = a.id AND s.student_id = ?
         WHERE a.target_student_id IS NULL OR a.target_student_id = ?
@@ -1384,68 +2201,37 @@ def tutoring_notices():
 def admin_home():
     admin = get_admin_user()
 
-    pending_admins = []
     managed_admins = []
     license_map = {}
 
     if admin["role"] == "super_admin":
-        pending_admins = query_db(
-            """
-            SELECT *
-            FROM users
-            WHERE role = 'admin' AND approved = 0
-            ORDER BY created_at ASC
-            """
-        )
-
         managed_admins = query_db(
             """
-            SELECT *
+            SELECT id, username, full_name, approved, created_at
             FROM users
             WHERE role = 'admin'
             ORDER BY created_at DESC
             """
         )
 
-        licenses = query_db(
+        licenses = query_db_tuples(
             """
             SELECT admin_id, menu_key, is_enabled
             FROM admin_licenses
+            ORDER BY admin_id
             """
         )
-        for license_row in licenses:
-            license_map.setdefault(license_row["admin_id"], {})[license_row["menu_key"]] = license_row[
-                "is_enabled"
-            ]
-
-    tracked_menu_placeholders = ",".join(["?"] * len(TRACKED_MENU_KEYS))
-    activity_logs = query_db(
-        f"""
-        SELECT l.*, u.username AS actor_username, u.full_name AS actor_name
-        FROM audit_logs l
-        LEFT JOIN users u ON u.id = l.actor_admin_id
-        WHERE l.menu_key IN ({tracked_menu_placeholders})
-        ORDER BY l.created_at DESC
-        LIMIT 80
-        """,
-        TRACKED_MENU_KEYS,
-    )
+        license_map = {
+            admin_id: {menu_key: is_enabled for _admin_id, menu_key, is_enabled in admin_rows}
+            for admin_id, admin_rows in groupby(licenses, key=lambda row: row[0])
+        }
 
-    count_row = query_db(
-        """
-        SELECT
-            (SELECT COUNT(*) FROM users WHERE role = 'student') AS students,
-            (SELECT COUNT(*) FROM questions) AS questions,
-            (SELECT COUNT(*) FROM assignments) AS assignments,
-            (SELECT COUNT(*) FROM notices) AS notices
-        """,
-        one=True,
-    )
-    counts = dict(count_row)
+    activity_logs = query_db_iter(ADMIN_ACTIVITY_LOGS_SQL, TRACKED_MENU_KEYS)
+
+    counts = fetch_dashboard_counts()
 
     return render_template(
         "admin/home.html",
-        pending_admins=pending_admins,
         managed_admins=managed_admins,
         license_map=license_map,
         activity_logs=activity_logs,
@@ -1456,22 +2242,26 @@ def admin_home():
 @app.route("/admin/login", methods=["GET", "POST"])
 def admin_login():
     if request.method == "POST":
-        username = request.form.get("username", "").strip()
-        password = request.form.get("password", "")
-
-        admin = query_db(
-            "SELECT * FROM users WHERE username = ? AND role IN ('admin', 'super_admin')",
-            (username,),
-            one=True,
-        )
-
-        if admin and check_password_hash(admin["password_hash"], password):
-            session["admin_id"] = admin["id"]
-            if admin["role"] == "admin" and admin["approved"] != 1:
-                flash("Account created, but waiting for master admin approval.", "warning")
-            else:
-                flash("Admin login successful.", "success")
-            return redirect(url_for("admin_home"))
+        form = request.form
+        username = form.get("username", "").strip()
+        password = form.get("password", "")
+
+        if is_plausible_login(username, password):
+            admin = query_db(
+                "SELECT id, password_hash, role, approved FROM users WHERE username = ? AND role IN ('admin', 'super_admin')",
+                (username,),
+                one=True,
+            )
+            if admin is None:
+                reject_unknown_login(password)
+            elif verify_password(admin["password_hash"], password):
+                upgrade_password_hash(admin, password)
+                session["admin_id"] = admin["id"]
+                if admin["role"] == "admin" and admin["approved"] != 1:
+                    flash("Account created, but waiting for master admin approval.", "warning")
+                else:
+                    flash("Admin login successful.", "success")
+                return redirect(url_for("admin_home"))
 
         flash("Invalid username or password.", "danger")
 
@@ -1480,29 +2270,42 @@ def admin_login():
 
 @app.post("/admin/register")
 def admin_register():
-    username = request.form.get("username", "").strip()
-    password = request.form.get("password", "")
-    full_name = request.form.get("full_name", "").strip()
-    email = request.form.get("email", "").strip()
-    phone = request.form.get("phone", "").strip()
+    form = request.form
+    username = form.get("username", "").strip()
+    password = form.get("password", "")
+    full_name = form.get("full_name", "").strip()
+    email = form.get("email", "").strip()
+    phone = form.get("phone", "").strip()
 
     if not username or not password or not full_name:
         flash("Username, password, and name are required.", "danger")
         return redirect(url_for("admin_login"))
 
-    existing = query_db("SELECT id FROM users WHERE username = ?", (username,), one=True)
+    credential_error = credential_length_error(username, password)
+    if credential_error:
+        flash(credential_error, "danger")
+        return redirect(url_for("admin_login"))
+
+    existing = query_scalar("SELECT id FROM users WHERE username = ?", (username,))
     if existing is not None:
         flash("This username is already in use.", "danger")
         return redirect(url_for("admin_login"))
 
+    # Hashed only once the cheap checks pass; a concurrent registration of the same name still loses on UNIQUE.
+    password_hash = hash_password(password)
     db = get_db()
-    cursor = db.execute(
-        """
-        INSERT INTO users (username, password_hash, role, full_name, email, phone, approved)
-        VALUES (?, ?, 'admin', ?, ?, ?, 0)
-        """,
-        (username, generate_password_hash(password), full_name, email, phone),
-    )
+    try:
+        cursor = db.execute(
+            """
+            INSERT INTO users (username, password_hash, role, full_name, email, phone, approved)
+            VALUES (?, ?, 'admin', ?, ?, ?, 0)
+            """,
+            (username, password_hash, full_name, email, phone),
+        )
+    except _db_integrity_errors():
+        db.rollback()
+        flash("This username is already in use.", "danger")
+        return redirect(url_for("admin_login"))
     new_admin_id = cursor.lastrowid
     ensure_admin_license_rows(new_admin_id)
     db.commit()
@@ -1524,31 +2327,39 @@ def admin_profile():
     admin = get_admin_user()
 
     if request.method == "POST":
-        username = request.form.get("username", "").strip()
-        full_name = request.form.get("full_name", "").strip()
-        email = request.form.get("email", "").strip()
-        phone = request.form.get("phone", "").strip()
-        age_raw = request.form.get("age", "").strip()
+        form = request.form
+        username = form.get("username", "").strip()
+        full_name = form.get("full_name", "").strip()
+        email = form.get("email", "").strip()
+        phone = form.get("phone", "").strip()
+        age_raw = form.get("age", "").strip()
         age = as_int(age_raw, 0) if age_raw else None
-        education = request.form.get("education", "").strip()
-        certificates = request.form.get("certificates", "").strip()
-        bio = request.form.get("bio", "").strip()
-        new_password = request.form.get("new_password", "")
+        education = form.get("education", "").strip()
+        certificates = form.get("certificates", "").strip()
+        bio = form.get("bio", "").strip()
+        new_password = form.get("new_password", "")
 
         if not full_name:
             flash("Name is required.", "danger")
             return redirect(url_for("admin_profile"))
 
+        credential_error = credential_length_error(
+            username if admin["role"] == "super_admin" else None,
+            new_password,
+        )
+        if credential_error:
+            flash(credential_error, "danger")
+            return redirect(url_for("admin_profile"))
+
         next_username = admin["username"]
         if admin["role"] == "super_admin":
             if not username:
                 flash("Master admin username is required.", "danger")
                 return redirect(url_for("admin_profile"))
 
-            duplicate = query_db(
+            duplicate = query_scalar(
                 "SELECT id FROM users WHERE username = ? AND id <> ?",
                 (username, admin["id"]),
-                one=True,
             )
             if duplicate is not None:
                 flash("This username is already in use.", "danger")
@@ -1558,28 +2369,38 @@ def admin_profile():
         if age is not None and age < 0:
             age = 0
 
+        new_password_hash = hash_password(new_password) if new_password else None
         db = get_db()
         db.execute(
             """
             UPDATE users
-            SET username = ?, full_name = ?, email = ?, phone = ?, age = ?, education = ?, certificates = ?, bio = ?, updated_at = CURRENT_TIMESTAMP
+            SET
+                username = ?, full_name = ?, email = ?, phone = ?, age = ?, education = ?, certificates = ?, bio = ?,
+                password_hash = COALESCE(?, password_hash),
+                updated_at = CURRENT_TIMESTAMP
             WHERE id = ?
             """,
-            (next_username, full_name, email, phone, age, education, certificates, bio, admin["id"]),
+            (
+                next_username,
+                full_name,
+                email,
+                phone,
+                age,
+                education,
+                certificates,
+                bio,
+                new_password_hash,
+                admin["id"],
+            ),
         )
-
-        if new_password:
-            db.execute(
-                "UPDATE users SET password_hash = ?, updated_at = CURRENT_TIMESTAMP WHERE id = ?",
-                (generate_password_hash(new_password), admin["id"]),
-            )
+        if admin["role"] == "super_admin":
+            db.execute(PORTFOLIO_REVISION_BUMP_SQL)
 
         db.commit()
+        invalidate_portfolio_cache()
         flash("Admin profile has been updated.", "success")
         return redirect(url_for("admin_profile"))
 
-    admin = query_db("SELECT * FROM users WHERE id = ?", (admin["id"],), one=True)
-    g.admin_user = admin
     return render_template("admin/profile.html", admin=admin)
 
 
@@ -1589,26 +2410,27 @@ def admin_portfolio():
     admin = get_admin_user()
 
     if request.method == "POST":
-        full_name = request.form.get("full_name", "").strip()
-        email = request.form.get("email", "").strip()
-        phone = request.form.get("phone", "").strip()
-        age_raw = request.form.get("age", "").strip()
+        form = request.form
+        full_name = form.get("full_name", "").strip()
+        email = form.get("email", "").strip()
+        phone = form.get("phone", "").strip()
+        age_raw = form.get("age", "").strip()
         age = as_int(age_raw, 0) if age_raw else None
-        education = request.form.get("education", "").strip()
-        certificates = request.form.get("certificates", "").strip()
-        intro = request.form.get("intro", "").strip()
+        education = form.get("education", "").strip()
+        certificates = form.get("certificates", "").strip()
+        intro = form.get("intro", "").strip()
 
-        about_note = request.form.get("about_note", "").strip()
-        skills_note = request.form.get("skills_note", "").strip()
-        contact_note = request.form.get("contact_note", "").strip()
-        github = request.form.get("github", "").strip()
-        location = request.form.get("location", "").strip()
+        about_note = form.get("about_note", "").strip()
+        skills_note = form.get("skills_note", "").strip()
+        contact_note = form.get("contact_note", "").strip()
+        github = form.get("github", "").strip()
+        location = form.get("location", "").strip()
 
-        skills_lines = request.form.get("skills", "")
+        skills_lines = form.get("skills", "")
         skills = _normalize_string_list(skills_lines.splitlines())
 
-        project_titles = request.form.getlist("project_title")
-        project_summaries = request.form.getlist("project_summary")
+        project_titles = form.getlist("project_title")
+        project_summaries = form.getlist("project_summary")
         projects = []
         for idx, title in enumerate(project_titles):
             summary = project_summaries[idx] if idx < len(project_summaries) else ""
@@ -1647,12 +2469,9 @@ def admin_portfolio():
             (full_name, email, phone, age, education, certificates, intro, admin["id"]),
         )
 
-        current_content = query_db(
-            "SELECT id FROM portfolio_content ORDER BY id ASC LIMIT 1",
-            one=True,
-        )
+        current_content_id = query_scalar("SELECT id FROM portfolio_content ORDER BY id ASC LIMIT 1")
 
-        if current_content is None:
+        if current_content_id is None:
             db.execute(
                 """
                 INSERT INTO portfolio_content (
@@ -1673,8 +2492,8 @@ def admin_portfolio():
                     contact_note,
                     github,
                     location,
-                    json.dumps(skills, ensure_ascii=False),
-                    json.dumps(projects, ensure_ascii=False),
+                    _json_dumps(skills),
+                    _json_dumps(projects),
                 ),
             )
         else:
@@ -1689,6 +2508,7 @@ def admin_portfolio():
                     location = ?,
                     skills_json = ?,
                     projects_json = ?,
+                    revision = revision + 1,
                     updated_at = CURRENT_TIMESTAMP
                 WHERE id = ?
                 """,
@@ -1698,13 +2518,14 @@ def admin_portfolio():
                     contact_note,
                     github,
                     location,
-                    json.dumps(skills, ensure_ascii=False),
-                    json.dumps(projects, ensure_ascii=False),
-                    current_content["id"],
+                    _json_dumps(skills),
+                    _json_dumps(projects),
+                    current_content_id,
                 ),
             )
 
         db.commit()
+        invalidate_portfolio_cache()
         flash("Portfolio content has been updated.", "success")
         return redirect(url_for("admin_portfolio"))
 
@@ -1730,38 +2551,33 @@ def admin_portfolio():
 @app.post("/admin/accounts/<int:target_admin_id>/update")
 @admin_required(super_admin_only=True)
 def admin_update_account(target_admin_id):
-    target = query_db(
-        "SELECT * FROM users WHERE id = ? AND role = 'admin'",
+    target_username = query_scalar(
+        "SELECT username FROM users WHERE id = ? AND role = 'admin'",
         (target_admin_id,),
-        one=True,
     )
-    if target is None:
+    if target_username is None:
         flash("Admin account not found.", "danger")
         return redirect(url_for("admin_home"))
 
-    approved = 1 if request.form.get("approved") == "on" else 0
+    form = request.form
+    approved = 1 if form.get("approved") == "on" else 0
 
     db = get_db()
     db.execute(
-        "UPDATE users SET approved = ?, updated_at = CURRENT_TIMESTAMP WHERE id = ?",
-        (approved, target_admin_id),
+        "UPDATE users SET approved = ?, updated_at = CURRENT_TIMESTAMP WHERE id = ? AND approved <> ?",
+        (approved, target_admin_id, approved),
     )
 
     ensure_admin_license_rows(target_admin_id)
 
-    for menu_key, _label in LICENSE_MENUS:
-        enabled = 1 if request.form.get(f"license_{menu_key}") == "on" else 0
-        db.execute(
-            """
-            UPDATE admin_licenses
-            SET is_enabled = ?
-            WHERE admin_id = ? AND menu_key = ?
-            """,
-            (enabled, target_admin_id, menu_key),
-        )
+    form_get = form.get
+    license_case_params = []
+    for menu_key, field_name in LICENSE_FORM_FIELDS:
+        license_case_params.extend((menu_key, 1 if form_get(field_name) == "on" else 0))
+    db.execute(LICENSE_ROWS_UPDATE_SQL, (*license_case_params, target_admin_id, *license_case_params))
 
     db.commit()
-    g.pop(f"admin_license_map_{target_admin_id}", None)
+    g.pop(f"admin_license_set_{target_admin_id}", None)
 
     state_text = "approved" if approved == 1 else "pending"
     log_admin_action(
@@ -1769,7 +2585,7 @@ def admin_update_account(target_admin_id):
         "license_update",
         "admin_account",
         target_admin_id,
-        f"{target['username']} state:{state_text}",
+        f"{target_username} state:{state_text}",
     )
     flash("Admin license/approval state has been updated.", "success")
     return redirect(url_for("admin_home"))
@@ -1781,18 +2597,16 @@ def admin_delete_account(target_admin_id):
         flash("You cannot delete the currently logged-in admin account.", "danger")
         return redirect(url_for("admin_home"))
 
-    target = query_db(
-        "SELECT * FROM users WHERE id = ? AND role = 'admin'",
+    target = execute_returning(
+        "DELETE FROM users WHERE id = ? AND role = 'admin' RETURNING username",
         (target_admin_id,),
-        one=True,
+        fallback_query="SELECT username FROM users WHERE id = ? AND role = 'admin'",
     )
     if target is None:
         flash("Admin account to delete was not found.", "danger")
         return redirect(url_for("admin_home"))
 
-    db = get_db()
-    db.execute("DELETE FROM users WHERE id = ?", (target_admin_id,))
-    db.commit()
+    get_db().commit()
 
     log_admin_action(
         "student_accounts",
@@ -1807,13 +2621,14 @@ def admin_delete_account(target_admin_id):
 @admin_required(menu_key="qna")
 def admin_qna():
     if request.method == "POST":
-        action = request.form.get("action")
+        form = request.form
+        action = form.get("action")
         db = get_db()
 
         if action == "answer":
-            question_id = as_int(request.form.get("question_id"), 0)
-            content = request.form.get("content", "").strip()
-            question = query_db("SELECT * FROM questions WHERE id = ?", (question_id,), one=True)
+            question_id = as_int(form.get("question_id"), 0)
+            content = form.get("content", "").strip()
+            question = query_scalar("SELECT 1 FROM questions WHERE id = ?", (question_id,))
 
             if question is None or not content:
                 flash("Question not found or answer content is empty.", "danger")
@@ -1832,54 +2647,75 @@ def admin_qna():
             flash("Answer has been added.", "success")
 
         elif action == "delete_question":
-            question_id = as_int(request.form.get("question_id"), 0)
-            question = query_db("SELECT id FROM questions WHERE id = ?", (question_id,), one=True)
+            question_id = as_int(form.get("question_id"), 0)
+            question = execute_returning(
+                "DELETE FROM questions WHERE id = ? RETURNING id",
+                (question_id,),
+                fallback_query="SELECT id FROM questions WHERE id = ?",
+            )
             if question is None:
                 flash("Question not found.", "danger")
             else:
-                db.execute("DELETE FROM questions WHERE id = ?", (question_id,))
                 db.commit()
                 log_admin_action("qna", "delete_question", "question", question_id, "question_deleted")
                 flash("Question has been deleted.", "success")
 
         elif action == "delete_answer":
-            answer_id = as_int(request.form.get("answer_id"), 0)
-            answer = query_db("SELECT * FROM question_answers WHERE id = ?", (answer_id,), one=True)
+            answer_id = as_int(form.get("answer_id"), 0)
+            answer = execute_returning(
+                "DELETE FROM question_answers WHERE id = ? RETURNING id",
+                (answer_id,),
+                fallback_query="SELECT id FROM question_answers WHERE id = ?",
+            )
             if answer is None:
                 flash("Answer not found.", "danger")
             else:
-                db.execute("DELETE FROM question_answers WHERE id = ?", (answer_id,))
                 db.commit()
                 log_admin_action("qna", "delete_answer", "answer", answer_id, "answer_deleted")
                 flash("Answer has been deleted.", "success")
 
         return redirect(url_for("admin_qna"))
 
-    questions = query_db(
+    rows = query_db(
         """
-        SELECT q.*, u.full_name AS student_name, u.username AS student_username
+        SELECT
+            q.*,
+            u.full_name AS student_name,
+            u.username AS student_username,
+            a.id AS answer_id,
+            a.admin_id AS answer_admin_id,
+            a.content AS answer_content,
+            a.created_at AS answer_created_at,
+            au.full_name AS answer_admin_name,
+            au.username AS answer_admin_username
         FROM questions q
         JOIN users u ON u.id = q.student_id
-        ORDER BY q.created_at DESC
+        LEFT JOIN question_answers a ON a.question_id = q.id
+        LEFT JOIN users au ON au.id = a.admin_id
+        ORDER BY q.created_at DESC, q.id, a.created_at ASC
         """
     )
 
-    question_ids = [question["id"] for question in questions]
+    questions = []
     answers_by_question = {}
-    if question_ids:
-        placeholders = ",".join(["?"] * len(question_ids))
-        answers = query_db(
-            f"""
-            SELECT a.*, u.full_name AS admin_name, u.username AS admin_username
-            FROM question_answers a
-            LEFT JOIN users u ON u.id = a.admin_id
-            WHERE a.question_id IN ({placeholders})
-            ORDER BY a.created_at ASC
-            """,
-            tuple(question_ids),
-        )
-        for answer in answers:
-            answers_by_question.setdefault(answer["question_id"], []).append(answer)
+    for question_id, question_rows in groupby(rows, key=lambda row: row["id"]):
+        question_rows = list(question_rows)
+        questions.append(question_rows[0])
+        answers = [
+            {
+                "id": row["answer_id"],
+                "question_id": question_id,
+                "admin_id": row["answer_admin_id"],
+                "content": row["answer_content"],
+                "created_at": row["answer_created_at"],
+                "admin_name": row["answer_admin_name"],
+                "admin_username": row["answer_admin_username"],
+            }
+            for row in question_rows
+            if row["answer_id"] is not None
+        ]
+        if answers:
+            answers_by_question[question_id] = answers
 
     return render_template(
         "admin/qna.html",
@@ -1890,14 +2726,15 @@ def admin_qna():
 @admin_required(menu_key="assignments")
 def admin_assignments():
     if request.method == "POST":
-        action = request.form.get("action")
+        form = request.form
+        action = form.get("action")
         db = get_db()
 
         if action == "create_assignment":
-            title = request.form.get("title", "").strip()
-            description = request.form.get("description", "").strip()
-            due_date = request.form.get("due_date", "").strip() or None
-            target_student_raw = request.form.get("target_student_id", "").strip()
+            title = form.get("title", "").strip()
+            description = form.get("description", "").strip()
+            due_date = form.get("due_date", "").strip() or None
+            target_student_raw = form.get("target_student_id", "").strip()
 
             target_student_id = as_int(target_student_raw, 0) if target_student_raw else None
             if target_student_id is not None and target_student_id <= 0:
@@ -1933,26 +2770,24 @@ def admin_assignments():
             flash("Assignment has been created.", "success")
 
         elif action == "update_submission":
-            submission_id = as_int(request.form.get("submission_id"), 0)
-            progress = max(0, min(100, as_int(request.form.get("progress"), 0)))
-            status = request.form.get("status", "").strip() or "in-progress"
+            submission_id = as_int(form.get("submission_id"), 0)
+            progress = clamp(as_int(form.get("progress"), 0), 0, 100)
+            status = form.get("status", "").strip() or "in-progress"
 
-            submission = query_db(
-                "SELECT * FROM assignment_submissions WHERE id = ?",
-                (submission_id,),
-                one=True,
+            submission = execute_returning(
+                """
+                UPDATE assignment_submissions
+                SET progress = ?, status = ?, updated_at = CURRENT_TIMESTAMP
+                WHERE id = ?
+                RETURNING id
+                """,
+                (progress, status, submission_id),
+                fallback_query="SELECT id FROM assignment_submissions WHERE id = ?",
+                fallback_args=(submission_id,),
             )
             if submission is None:
                 flash("Submission not found.", "danger")
             else:
-                db.execute(
-                    """
-                    UPDATE assignment_submissions
-                    SET progress = ?, status = ?, updated_at = CURRENT_TIMESTAMP
-                    WHERE id = ?
-                    """,
-                    (progress, status, submission_id),
-                )
                 db.commit()
                 log_admin_action(
                     "assignments",
@@ -1964,12 +2799,15 @@ def admin_assignments():
                 flash("Student assignment progress has been updated.", "success")
 
         elif action == "delete_assignment":
-            assignment_id = as_int(request.form.get("assignment_id"), 0)
-            assignment = query_db("SELECT * FROM assignments WHERE id = ?", (assignment_id,), one=True)
+            assignment_id = as_int(form.get("assignment_id"), 0)
+            assignment = execute_returning(
+                "DELETE FROM assignments WHERE id = ? RETURNING title",
+                (assignment_id,),
+                fallback_query="SELECT title FROM assignments WHERE id = ?",
+            )
             if assignment is None:
                 flash("Assignment not found.", "danger")
             else:
-                db.execute("DELETE FROM assignments WHERE id = ?", (assignment_id,))
                 db.commit()
                 log_admin_action(
                     "assignments",
@@ -1997,16 +2835,10 @@ def admin_assignments():
             a.*,
             u.full_name AS creator_name,
             ts.full_name AS target_student_name,
-            ts.username AS target_student_username,
-            COALESCE(sc.submission_count, 0) AS submission_count
+            ts.username AS target_student_username
         FROM assignments a
         LEFT JOIN users u ON u.id = a.created_by
         LEFT JOIN users ts ON ts.id = a.target_student_id
-        LEFT JOIN (
-            SELECT assignment_id, COUNT(*) AS submission_count
-            FROM assignment_submissions
-            GROUP BY assignment_id
-        ) sc ON sc.assignment_id = a.id
         ORDER BY a.created_at DESC
         """
     )
@@ -2039,21 +2871,18 @@ def admin_assignments():
 @admin_required(menu_key="scores")
 def admin_scores():
     if request.method == "POST":
-        action = request.form.get("action")
+        form = request.form
+        action = form.get("action")
         db = get_db()
 
         if action == "add_score":
-            student_id = as_int(request.form.get("student_id"), 0)
-            test_name = request.form.get("test_name", "").strip()
-            score = as_float(request.form.get("score"), 0)
-            max_score = as_float(request.form.get("max_score"), 100)
-            analysis = request.form.get("analysis", "").strip()
+            student_id = as_int(form.get("student_id"), 0)
+            test_name = form.get("test_name", "").strip()
+            score = as_float(form.get("score"), 0)
+            max_score = as_float(form.get("max_score"), 100)
+            analysis = form.get("analysis", "").strip()
 
-            student = query_db(
-                "SELECT id FROM users WHERE id = ? AND role = 'student'",
-                (student_id,),
-                one=True,
-            )
+            student = query_scalar("SELECT id FROM users WHERE id = ? AND role = 'student'", (student_id,))
             if student is None or not test_name or max_score <= 0:
                 flash("Please check student, test name, and max score.", "danger")
                 return redirect(url_for("admin_scores"))
@@ -2071,12 +2900,15 @@ def admin_scores():
             flash("Score has been created.", "success")
 
         elif action == "delete_score":
-            score_id = as_int(request.form.get("score_id"), 0)
-            score = query_db("SELECT * FROM scores WHERE id = ?", (score_id,), one=True)
+            score_id = as_int(form.get("score_id"), 0)
+            score = execute_returning(
+                "DELETE FROM scores WHERE id = ? RETURNING test_name",
+                (score_id,),
+                fallback_query="SELECT test_name FROM scores WHERE id = ?",
+            )
             if score is None:
                 flash("Score data was not found.", "danger")
             else:
-                db.execute("DELETE FROM scores WHERE id = ?", (score_id,))
                 db.commit()
                 log_admin_action("scores", "delete", "score", score_id, score["test_name"])
                 flash("Score has been deleted.", "success")
@@ -2087,30 +2919,42 @@ def admin_scores():
         "SELECT id, username, full_name FROM users WHERE role = 'student' ORDER BY full_name ASC"
     )
 
-    scores = query_db(
-        """
-        SELECT s.*, st.full_name AS student_name, st.username AS student_username, a.full_name AS admin_name
-        FROM scores s
-        JOIN users st ON st.id = s.student_id
-        LEFT JOIN users a ON a.id = s.announced_by
-        ORDER BY s.created_at DESC
-        """
+    page = current_page()
+    scores, has_next_page = split_page(
+        query_db(
+            """
+            SELECT s.*, st.full_name AS student_name, st.username AS student_username, a.full_name AS admin_name
+            FROM scores s
+            JOIN users st ON st.id = s.student_id
+            LEFT JOIN users a ON a.id = s.announced_by
+            ORDER BY s.created_at DESC
+            LIMIT ? OFFSET ?
+            """,
+            page_window(page),
+        )
     )
 
-    return render_template("admin/scores.html", students=students, scores=scores)
+    return render_template(
+        "admin/scores.html",
+        students=students,
+        scores=scores,
+        page=page,
+        has_next_page=has_next_page,
+    )
 
 
 @app.route("/admin/notices", methods=["GET", "POST"])
 @admin_required(menu_key="notices")
 def admin_notices():
     if request.method == "POST":
-        action = request.form.get("action")
+        form = request.form
+        action = form.get("action")
         db = get_db()
 
         if action == "create_notice":
-            title = request.form.get("title", "").strip()
-            content = request.form.get("content", "").strip()
-            is_pinned = 1 if request.form.get("is_pinned") == "on" else 0
+            title = form.get("title", "").strip()
+            content = form.get("content", "").strip()
+            is_pinned = 1 if form.get("is_pinned") == "on" else 0
 
             if not title or not content:
                 flash("Title and content are required.", "danger")
@@ -2129,35 +2973,38 @@ def admin_notices():
             flash("Notice has been created.", "success")
 
         elif action == "toggle_pin":
-            notice_id = as_int(request.form.get("notice_id"), 0)
-            notice = query_db("SELECT * FROM notices WHERE id = ?", (notice_id,), one=True)
+            notice_id = as_int(form.get("notice_id"), 0)
+            notice = execute_returning(
+                """
+                UPDATE notices
+                SET
+                    is_pinned = 1 - is_pinned,
+                    pinned_at = CASE WHEN is_pinned = 0 THEN CURRENT_TIMESTAMP ELSE NULL END,
+                    updated_at = CURRENT_TIMESTAMP
+                WHERE id = ?
+                RETURNING is_pinned, title
+                """,
+                (notice_id,),
+                fallback_query="SELECT 1 - is_pinned AS is_pinned, title FROM notices WHERE id = ?",
+            )
             if notice is None:
                 flash("Notice not found.", "danger")
             else:
-                next_state = 0 if notice["is_pinned"] == 1 else 1
-                db.execute(
-                    """
-                    UPDATE notices
-                    SET
-                        is_pinned = ?,
-                        pinned_at = CASE WHEN ? = 1 THEN CURRENT_TIMESTAMP ELSE NULL END,
-                        updated_at = CURRENT_TIMESTAMP
-                    WHERE id = ?
-                    """,
-                    (next_state, next_state, notice_id),
-                )
                 db.commit()
-                action_text = "pin" if next_state == 1 else "unpin"
+                action_text = "pin" if notice["is_pinned"] == 1 else "unpin"
                 log_admin_action("notices", action_text, "notice", notice_id, notice["title"])
                 flash("Pinned state has been changed.", "success")
 
         elif action == "delete_notice":
-            notice_id = as_int(request.form.get("notice_id"), 0)
-            notice = query_db("SELECT * FROM notices WHERE id = ?", (notice_id,), one=True)
+            notice_id = as_int(form.get("notice_id"), 0)
+            notice = execute_returning(
+                "DELETE FROM notices WHERE id = ? RETURNING title",
+                (notice_id,),
+                fallback_query="SELECT title FROM notices WHERE id = ?",
+            )
             if notice is None:
                 flash("Notice not found.", "danger")
             else:
-                db.execute("DELETE FROM notices WHERE id = ?", (notice_id,))
                 db.commit()
                 log_admin_action("notices", "delete", "notice", notice_id, notice["title"])
                 flash("Notice has been deleted.", "success")
@@ -2176,102 +3023,116 @@ def admin_notices():
 @admin_required(menu_key="student_accounts")
 def admin_students():
     if request.method == "POST":
-        action = request.form.get("action")
+        form = request.form
+        action = form.get("action")
         db = get_db()
 
         if action == "create_student":
-            username = request.form.get("username", "").strip()
-            password = request.form.get("password", "")
-            full_name = request.form.get("full_name", "").strip()
-            email = request.form.get("email", "").strip()
-            phone = request.form.get("phone", "").strip()
-            age = as_int(request.form.get("age"), 0)
-            education = request.form.get("education", "").strip()
+            username = form.get("username", "").strip()
+            password = form.get("password", "")
+            full_name = form.get("full_name", "").strip()
+            email = form.get("email", "").strip()
+            phone = form.get("phone", "").strip()
+            age = as_int(form.get("age"), 0)
+            education = form.get("education", "").strip()
 
             if not username or not password or not full_name:
                 flash("Username, password, and name are required.", "danger")
                 return redirect(url_for("admin_students"))
 
-            duplicate = query_db("SELECT id FROM users WHERE username = ?", (username,), one=True)
-            if duplicate is not None:
-                flash("This student username is already in use.", "danger")
+            credential_error = credential_length_error(username, password)
+            if credential_error:
+                flash(credential_error, "danger")
                 return redirect(url_for("admin_students"))
 
-            cursor = db.execute(
-                """
-                INSERT INTO users (username, password_hash, role, full_name, email, phone, age, education, approved)
-                VALUES (?, ?, 'student', ?, ?, ?, ?, ?, 1)
-                """,
-                (username, generate_password_hash(password), full_name, email, phone, age, education),
-            )
+            # users.username is UNIQUE, so the insert itself is the duplicate check.
+            password_hash = hash_password(password)
+            try:
+                cursor = db.execute(
+                    """
+                    INSERT INTO users (username, password_hash, role, full_name, email, phone, age, education, approved)
+                    VALUES (?, ?, 'student', ?, ?, ?, ?, ?, 1)
+                    """,
+                    (username, password_hash, full_name, email, phone, age, education),
+                )
+            except _db_integrity_errors():
+                db.rollback()
+                flash("This student username is already in use.", "danger")
+                return redirect(url_for("admin_students"))
             db.commit()
             log_admin_action("student_accounts", "create", "student", cursor.lastrowid, username)
             flash("Student account has been created.", "success")
 
         elif action == "update_student":
-            student_id = as_int(request.form.get("student_id"), 0)
-            full_name = request.form.get("full_name", "").strip()
-            email = request.form.get("email", "").strip()
-            phone = request.form.get("phone", "").strip()
-            age = as_int(request.form.get("age"), 0)
-            education = request.form.get("education", "").strip()
-            certificates = request.form.get("certificates", "").strip()
-            bio = request.form.get("bio", "").strip()
-            new_password = request.form.get("new_password", "")
-
-            target = query_db(
-                "SELECT * FROM users WHERE id = ? AND role = 'student'",
-                (student_id,),
-                one=True,
-            )
-            if target is None:
-                flash("Student account not found.", "danger")
+            student_id = as_int(form.get("student_id"), 0)
+            full_name = form.get("full_name", "").strip()
+            email = form.get("email", "").strip()
+            phone = form.get("phone", "").strip()
+            age = as_int(form.get("age"), 0)
+            education = form.get("education", "").strip()
+            certificates = form.get("certificates", "").strip()
+            bio = form.get("bio", "").strip()
+            new_password = form.get("new_password", "")
+
+            credential_error = credential_length_error(password=new_password)
+            if credential_error:
+                flash(credential_error, "danger")
                 return redirect(url_for("admin_students"))
 
-            db.execute(
+            new_password_hash = hash_password(new_password) if new_password else None
+            target = execute_returning(
                 """
                 UPDATE users
-                SET full_name = ?, email = ?, phone = ?, age = ?, education = ?, certificates = ?, bio = ?, updated_at = CURRENT_TIMESTAMP
-                WHERE id = ?
+                SET
+                    full_name = ?, email = ?, phone = ?, age = ?, education = ?, certificates = ?, bio = ?,
+                    password_hash = COALESCE(?, password_hash),
+                    updated_at = CURRENT_TIMESTAMP
+                WHERE id = ? AND role = 'student'
+                RETURNING username
                 """,
-                (full_name, email, phone, age, education, certificates, bio, student_id),
+                (full_name, email, phone, age, education, certificates, bio, new_password_hash, student_id),
+                fallback_query="SELECT username FROM users WHERE id = ? AND role = 'student'",
+                fallback_args=(student_id,),
             )
-            if new_password:
-                db.execute(
-                    "UPDATE users SET password_hash = ?, updated_at = CURRENT_TIMESTAMP WHERE id = ?",
-                    (generate_password_hash(new_password), student_id),
-                )
+            if target is None:
+                flash("Student account not found.", "danger")
+                return redirect(url_for("admin_students"))
+
             db.commit()
             log_admin_action("student_accounts", "update", "student", student_id, target["username"])
             flash("Student profile has been updated.", "success")
 
         elif action == "delete_student":
-            student_id = as_int(request.form.get("student_id"), 0)
-            target = query_db(
-                "SELECT * FROM users WHERE id = ? AND role = 'student'",
+            student_id = as_int(form.get("student_id"), 0)
+            target = execute_returning(
+                "DELETE FROM users WHERE id = ? AND role = 'student' RETURNING username",
                 (student_id,),
-                one=True,
+                fallback_query="SELECT username FROM users WHERE id = ? AND role = 'student'",
             )
             if target is None:
                 flash("Student account not found.", "danger")
             else:
-                db.execute("DELETE FROM users WHERE id = ?", (student_id,))
                 db.commit()
                 log_admin_action("student_accounts", "delete", "student", student_id, target["username"])
                 flash("Student account has been deleted.", "success")
 
         return redirect(url_for("admin_students"))
 
-    students = query_db(
-        """
-        SELECT *
-        FROM users
-        WHERE role = 'student'
-        ORDER BY created_at DESC
-        """
+    page = current_page()
+    students, has_next_page = split_page(
+        query_db(
+            """
+            SELECT id, username, full_name, email, phone, age, education, certificates, bio
+            FROM users
+            WHERE role = 'student'
+            ORDER BY created_at DESC
+            LIMIT ? OFFSET ?
+            """,
+            page_window(page),
+        )
     )
 
-    return render_template("admin/students.html", students=students)
+    return render_template("admin/students.html", students=students, page=page, has_next_page=has_next_page)
 
 
 @app.errorhandler(403)
@@ -2284,12 +3145,20 @@ def page_not_found(_error):
     return render_template("error.html", title="404 Not Found", message="The requested page could not be found."), 404
 
 
+# Initialize once at import so requests skip the check; retry per request only if the database was not reachable yet.
+try:
+    with app.app_context():
+        ensure_db_initialized()
+except Exception:
+    app.logger.exception("Database initialization failed at startup; retrying on incoming requests")
+    app.before_request(ensure_db_initialized)
+
+
 if __name__ == "__main__":
     raw_port = os.environ.get("PORT", "5000")
     try:
         port = int(raw_port)
     except (TypeError, ValueError):
         port = 5000
-    debug = os.environ.get("FLASK_DEBUG", "0") == "1"
-    app.run(host="0.0.0.0", port=port, debug=debug)
+    app.run(host="0.0.0.0", port=port, debug=DEBUG_MODE)
 